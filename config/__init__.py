@@ -4,5 +4,14 @@ Configuration module for AzureSearch FileShare Indexer
 
 from .settings import Config
 from .logger import setup_logger, get_logger
+from .transport import RETRY_STATUSES, get_http_session, get_http_transport, retry_wait
 
-__all__ = ["Config", "setup_logger", "get_logger"]
\ No newline at end of file
+__all__ = [
+    "Config",
+    "setup_logger",
+    "get_logger",
+    "get_http_session",
+    "get_http_transport",
+    "retry_wait",
+    "RETRY_STATUSES",
+]
\ No newline at end of file
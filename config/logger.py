@@ -5,13 +5,75 @@ Author: Edgar McOchieng
 
 import sys
 import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import MappingProxyType
 from loguru import logger
 
+try:
+    import zstandard
+except ImportError:  # optional: rotated logs fall back to zip
+    zstandard = None
+
 
 # Flag to track if logger is initialized
 _logger_initialized = False
 
+# Log directories already created by this process
+_ensured_dirs = set()
+
+# Log format strings by style name
+_FORMATS = MappingProxyType({
+    "simple": "<level>{message}</level>",
+    "detailed": "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | <level>{message}</level>",
+    "json": "{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} | {message}"
+})
+
+# Single worker that compresses rotated log files off the logging thread
+# (worker threads are only started on first use)
+_compress_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-compress")
+
+
+# zstd level 3 compresses log text several times faster than DEFLATE
+# at a comparable ratio
+_ZSTD_LEVEL = 3
+
+
+def _zstd_file(path: str):
+    """Compress a file into a .zst archive"""
+    compressor = zstandard.ZstdCompressor(level=_ZSTD_LEVEL)
+    with open(path, 'rb') as src, open(f"{path}.zst", 'wb') as dst:
+        compressor.copy_stream(src, dst)
+
+
+def _zip_file(path: str):
+    """Compress a file into a .zip archive"""
+    with zipfile.ZipFile(f"{path}.zip", "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.write(path, arcname=os.path.basename(path))
+
+
+def _compress_file(path: str):
+    """Compress a rotated log file (zstd if available, else zip) and remove the original"""
+    try:
+        if zstandard is not None:
+            _zstd_file(path)
+        else:
+            _zip_file(path)
+        os.remove(path)
+    except Exception as e:
+        logger.warning(f"Could not compress rotated log {path}: {e}")
+
+
+def _compress_in_background(path: str):
+    """Rotation compression hook: queue the rotated file for compression"""
+    try:
+        _compress_pool.submit(_compress_file, path)
+    except RuntimeError:
+        # Worker already shut down during interpreter exit; compress inline
+        _compress_file(path)
+
+
 def log_exception(exc: Exception, message: str = "Exception occurred"):
     """
     Log an exception with traceback using loguru.
@@ -22,15 +84,24 @@ def log_exception(exc: Exception, message: str = "Exception occurred"):
     logger.error(f"{message}: {exc}", exc_info=True)
 
 
-def setup_logger(log_level="INFO", log_file="logs/indexer.log", log_to_console=True, log_format="detailed"):
+def setup_logger(log_level="INFO", log_file="logs/indexer.log", log_to_console=True, log_format="detailed",
+                 force=False, console_tty_only=False):
     """
     Configure logging based on provided settings
     
+    Calling this again after the logger is configured is a no-op unless
+    ``force`` is set, so sinks are never registered twice.
+    
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Path to log file
         log_to_console: Whether to log to console
         log_format: Format style (simple, detailed, json)
+        force: Reconfigure even if the logger was already initialized
+        console_tty_only: Only log to console when stdout is a terminal
+    
+    When stdout is not a terminal (CI, redirected output) the console sink
+    uses the plain "simple" format without colors.
     
     Supports multiple log formats:
     - simple: Basic messages only
@@ -39,31 +110,32 @@ def setup_logger(log_level="INFO", log_file="logs/indexer.log", log_to_console=T
     """
     global _logger_initialized
     
+    if _logger_initialized and not force:
+        return logger
+    
     # Remove default logger
     logger.remove()
     
-    # Define formats
-    formats = {
-        "simple": "<level>{message}</level>",
-        "detailed": "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | <level>{message}</level>",
-        "json": "{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} | {message}"
-    }
-    
-    log_format_str = formats.get(log_format, formats["detailed"])
+    log_format_str = _FORMATS.get(log_format) or _FORMATS["detailed"]
     
     # Console logging
-    if log_to_console:
+    is_tty = sys.stdout is not None and sys.stdout.isatty()
+    if log_to_console and (is_tty or not console_tty_only):
         logger.add(
             sys.stdout,
-            format=log_format_str,
+            format=log_format_str if is_tty else _FORMATS["simple"],
             level=log_level,
-            colorize=True
+            colorize=is_tty
         )
     
-    # File logging
+    # File logging, queued to a background thread so writes stay off the
+    # indexing threads; the sink stays line-buffered so records reach the
+    # file as they are logged
     if log_file:
-        log_path = Path(log_file)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
+        log_dir = str(Path(log_file).parent)
+        if log_dir not in _ensured_dirs:
+            Path(log_dir).mkdir(parents=True, exist_ok=True)
+            _ensured_dirs.add(log_dir)
         
         logger.add(
             log_file,
@@ -71,7 +143,8 @@ def setup_logger(log_level="INFO", log_file="logs/indexer.log", log_to_console=T
             level=log_level,
             rotation="10 MB",
             retention="30 days",
-            compression="zip"
+            compression=_compress_in_background,
+            enqueue=True
         )
     
     _logger_initialized = True
@@ -98,7 +171,8 @@ def get_logger(name: str = None):
                 log_level=Config.LOG_LEVEL,
                 log_file=Config.LOG_FILE,
                 log_to_console=Config.LOG_TO_CONSOLE,
-                log_format=Config.LOG_FORMAT
+                log_format=Config.LOG_FORMAT,
+                console_tty_only=Config.LOG_TO_CONSOLE_TTY_ONLY
             )
         except (ImportError, Exception):
             # Fallback to default settings if Config not available
@@ -3,14 +3,21 @@ Centralized configuration management with validation and environment support
 Author: Edgar McOchieng
 """
 
+import io
 import os
+import sys
+import functools
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Any, Mapping, FrozenSet
 from dotenv import load_dotenv
 import json
 
-# Load environment variables
-load_dotenv()
+try:
+    import orjson
+except ImportError:  # optional: save_config falls back to the json module
+    orjson = None
 
 
 class ConfigValidationError(Exception):
@@ -18,9 +25,68 @@ class ConfigValidationError(Exception):
     pass
 
 
-class Config:
+def _mask(value: str, mask_secrets: bool = True) -> str:
+    """Mask a secret value for display, keeping a short prefix and suffix"""
+    if not value or not mask_secrets:
+        return value
+    if len(value) <= 12:
+        return "***"
+    return f"{value[:8]}...{value[-4:]}"
+
+
+def _load_env_cache() -> bool:
+    """
+    Apply the compiled .env cache (see scripts/compile_env.py) if it is fresh
+    
+    Returns:
+        True if the cache was applied, False if missing or older than .env
+    """
+    try:
+        from ._env_cache import ENV, ENV_FILE, MTIME
+        if os.path.getmtime(ENV_FILE) > MTIME:
+            return False
+    except (ImportError, OSError):
+        return False
+    
+    # Same precedence as load_dotenv(): existing variables win
+    for key, value in ENV.items():
+        os.environ.setdefault(key, value)
+    return True
+
+
+@functools.lru_cache(maxsize=1)
+def _load_dotenv() -> bool:
+    """Load the .env file once per process; repeated calls are no-ops"""
+    return _load_env_cache() or load_dotenv()
+
+
+def _env_bool(env: Mapping[str, str], name: str, default: str) -> bool:
+    """Read a boolean environment variable ("true"/"false")"""
+    return env.get(name, default).lower() == "true"
+
+
+def _env_set(env: Mapping[str, str], name: str, default: str, lower: bool = False) -> FrozenSet[str]:
+    """Read a comma-separated environment variable into a set, dropping empty entries"""
+    items = (item.strip() for item in env.get(name, default).split(","))
+    return frozenset(item.lower() if lower else item for item in items if item)
+
+
+# Log levels at which the informational config dump is suppressed
+_QUIET_LOG_LEVELS = frozenset({"WARNING", "ERROR", "CRITICAL"})
+
+# slots=True is only available on Python 3.10+
+_DATACLASS_OPTIONS = {"frozen": True}
+if sys.version_info >= (3, 10):
+    _DATACLASS_OPTIONS["slots"] = True
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class _Config:
     """
-    Central configuration class with validation and environment support
+    Central configuration with validation and environment support
+    
+    Settings are read from the environment once at import and stored in a
+    frozen dataclass; use ``Config.reload()`` to pick up environment changes.
     
     Supports multiple deployment scenarios:
     - Development: Local testing with .env file
@@ -29,81 +95,136 @@ class Config:
     """
     
     # Environment
-    ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+    ENVIRONMENT: str
     
     #==========================================================================
     # Azure AI Search Configuration
     #==========================================================================
-    AZURE_SEARCH_ENDPOINT: str = os.getenv("AZURE_SEARCH_ENDPOINT", "")
-    AZURE_SEARCH_KEY: str = os.getenv("AZURE_SEARCH_KEY", "")
-    AZURE_SEARCH_INDEX_NAME: str = os.getenv("AZURE_SEARCH_INDEX_NAME", "fileshare-documents")
-    AZURE_SEARCH_VECTOR_INDEX_NAME: str = os.getenv("AZURE_SEARCH_VECTOR_INDEX_NAME", "fileshare-vector-documents")
-    AZURE_SEARCH_API_VERSION: str = os.getenv("AZURE_SEARCH_API_VERSION", "2023-11-01")
+    AZURE_SEARCH_ENDPOINT: str
+    AZURE_SEARCH_KEY: str
+    AZURE_SEARCH_INDEX_NAME: str
+    AZURE_SEARCH_VECTOR_INDEX_NAME: str
+    AZURE_SEARCH_API_VERSION: str
     
     #==========================================================================
     # Azure OpenAI Configuration
     #==========================================================================
-    AZURE_OPENAI_ENDPOINT: str = os.getenv("AZURE_OPENAI_ENDPOINT", "")
-    AZURE_OPENAI_KEY: str = os.getenv("AZURE_OPENAI_KEY", "")
-    AZURE_OPENAI_EMBEDDING_DEPLOYMENT: str = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT", "text-embedding-3-large")
-    AZURE_OPENAI_CHAT_DEPLOYMENT: str = os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT", "gpt-4")
-    AZURE_OPENAI_API_VERSION: str = os.getenv("AZURE_OPENAI_API_VERSION", "2024-05-01-preview")
-    EMBEDDING_DIMENSIONS: int = int(os.getenv("EMBEDDING_DIMENSIONS", "3072"))
+    AZURE_OPENAI_ENDPOINT: str
+    AZURE_OPENAI_KEY: str
+    AZURE_OPENAI_EMBEDDING_DEPLOYMENT: str
+    AZURE_OPENAI_CHAT_DEPLOYMENT: str
+    AZURE_OPENAI_API_VERSION: str
+    EMBEDDING_DIMENSIONS: int
     
     #==========================================================================
     # File Share Configuration
     #==========================================================================
-    FILE_SHARE_PATH: str = os.getenv("FILE_SHARE_PATH", "")
-    SUPPORTED_EXTENSIONS: List[str] = [
-        ext.strip() for ext in os.getenv("SUPPORTED_EXTENSIONS", ".txt,.docx,.pdf,.xlsx,.pptx").split(",")
-    ]
-    EXCLUDE_DIRECTORIES: List[str] = [
-        d.strip() for d in os.getenv("EXCLUDE_DIRECTORIES", "").split(",") if d.strip()
-    ]
-    MAX_FILE_SIZE_MB: int = int(os.getenv("MAX_FILE_SIZE_MB", "50"))
+    FILE_SHARE_PATH: str
+    SUPPORTED_EXTENSIONS: FrozenSet[str]
+    EXCLUDE_DIRECTORIES: FrozenSet[str]
+    MAX_FILE_SIZE_MB: int
     
     #==========================================================================
     # Indexing Configuration
     #==========================================================================
-    CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "1000"))
-    CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", "200"))
-    BATCH_SIZE: int = int(os.getenv("BATCH_SIZE", "100"))
-    MAX_WORKERS: int = int(os.getenv("MAX_WORKERS", "4"))
-    INCREMENTAL_INDEXING: bool = os.getenv("INCREMENTAL_INDEXING", "true").lower() == "true"
+    CHUNK_SIZE: int
+    CHUNK_OVERLAP: int
+    BATCH_SIZE: int
+    AUTOTUNE_BATCH: bool
+    MAX_WORKERS: int
+    UPLOAD_CONCURRENCY: int
+    INCREMENTAL_INDEXING: bool
     
     #==========================================================================
     # Search Configuration
     #==========================================================================
-    DEFAULT_TOP_K: int = int(os.getenv("DEFAULT_TOP_K", "5"))
-    ENABLE_SEMANTIC_RERANKING: bool = os.getenv("ENABLE_SEMANTIC_RERANKING", "true").lower() == "true"
-    MIN_RELEVANCE_SCORE: float = float(os.getenv("MIN_RELEVANCE_SCORE", "0.7"))
+    DEFAULT_TOP_K: int
+    ENABLE_SEMANTIC_RERANKING: bool
+    MIN_RELEVANCE_SCORE: float
     
     #==========================================================================
     # Logging Configuration
     #==========================================================================
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
-    LOG_FILE: str = os.getenv("LOG_FILE", "logs/indexer.log")
-    LOG_TO_CONSOLE: bool = os.getenv("LOG_TO_CONSOLE", "true").lower() == "true"
-    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "detailed")
+    LOG_LEVEL: str
+    LOG_FILE: str
+    LOG_TO_CONSOLE: bool
+    LOG_TO_CONSOLE_TTY_ONLY: bool
+    LOG_FORMAT: str
     
     #==========================================================================
     # Performance & Optimization
     #==========================================================================
-    CACHE_EMBEDDINGS: bool = os.getenv("CACHE_EMBEDDINGS", "true").lower() == "true"
-    CACHE_DIR: str = os.getenv("CACHE_DIR", ".cache")
-    MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
-    RETRY_DELAY: int = int(os.getenv("RETRY_DELAY", "2"))
+    CACHE_EMBEDDINGS: bool
+    CACHE_DIR: str
+    MAX_RETRIES: int
+    RETRY_DELAY: int
     
     #==========================================================================
     # Advanced Configuration
     #==========================================================================
-    ENABLE_TELEMETRY: bool = os.getenv("ENABLE_TELEMETRY", "false").lower() == "true"
+    ENABLE_TELEMETRY: bool
     
     @classmethod
-    def validate(cls, require_openai: bool = False) -> bool:
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "_Config":
+        """
+        Build configuration from environment variables
+        
+        The environment is snapshotted once and every setting is resolved
+        from that snapshot.
+        
+        Args:
+            env: Environment mapping (defaults to a copy of os.environ)
+            
+        Returns:
+            New configuration instance
+        """
+        env = dict(os.environ) if env is None else env
+        return cls(
+            ENVIRONMENT=env.get("ENVIRONMENT", "development"),
+            AZURE_SEARCH_ENDPOINT=env.get("AZURE_SEARCH_ENDPOINT", ""),
+            AZURE_SEARCH_KEY=env.get("AZURE_SEARCH_KEY", ""),
+            AZURE_SEARCH_INDEX_NAME=env.get("AZURE_SEARCH_INDEX_NAME", "fileshare-documents"),
+            AZURE_SEARCH_VECTOR_INDEX_NAME=env.get("AZURE_SEARCH_VECTOR_INDEX_NAME", "fileshare-vector-documents"),
+            AZURE_SEARCH_API_VERSION=env.get("AZURE_SEARCH_API_VERSION", "2023-11-01"),
+            AZURE_OPENAI_ENDPOINT=env.get("AZURE_OPENAI_ENDPOINT", ""),
+            AZURE_OPENAI_KEY=env.get("AZURE_OPENAI_KEY", ""),
+            AZURE_OPENAI_EMBEDDING_DEPLOYMENT=env.get("AZURE_OPENAI_EMBEDDING_DEPLOYMENT", "text-embedding-3-large"),
+            AZURE_OPENAI_CHAT_DEPLOYMENT=env.get("AZURE_OPENAI_CHAT_DEPLOYMENT", "gpt-4"),
+            AZURE_OPENAI_API_VERSION=env.get("AZURE_OPENAI_API_VERSION", "2024-05-01-preview"),
+            EMBEDDING_DIMENSIONS=int(env.get("EMBEDDING_DIMENSIONS", "3072")),
+            FILE_SHARE_PATH=env.get("FILE_SHARE_PATH", ""),
+            SUPPORTED_EXTENSIONS=_env_set(env, "SUPPORTED_EXTENSIONS", ".txt,.docx,.pdf,.xlsx,.pptx", lower=True),
+            EXCLUDE_DIRECTORIES=_env_set(env, "EXCLUDE_DIRECTORIES", ""),
+            MAX_FILE_SIZE_MB=int(env.get("MAX_FILE_SIZE_MB", "50")),
+            CHUNK_SIZE=int(env.get("CHUNK_SIZE", "1000")),
+            CHUNK_OVERLAP=int(env.get("CHUNK_OVERLAP", "200")),
+            BATCH_SIZE=int(env.get("BATCH_SIZE", "100")),
+            AUTOTUNE_BATCH=_env_bool(env, "AUTOTUNE_BATCH", "false"),
+            MAX_WORKERS=int(env.get("MAX_WORKERS", "4")),
+            UPLOAD_CONCURRENCY=int(env.get("UPLOAD_CONCURRENCY", "4")),
+            INCREMENTAL_INDEXING=_env_bool(env, "INCREMENTAL_INDEXING", "true"),
+            DEFAULT_TOP_K=int(env.get("DEFAULT_TOP_K", "5")),
+            ENABLE_SEMANTIC_RERANKING=_env_bool(env, "ENABLE_SEMANTIC_RERANKING", "true"),
+            MIN_RELEVANCE_SCORE=float(env.get("MIN_RELEVANCE_SCORE", "0.7")),
+            LOG_LEVEL=env.get("LOG_LEVEL", "INFO"),
+            LOG_FILE=env.get("LOG_FILE", "logs/indexer.log"),
+            LOG_TO_CONSOLE=_env_bool(env, "LOG_TO_CONSOLE", "true"),
+            LOG_TO_CONSOLE_TTY_ONLY=_env_bool(env, "LOG_TO_CONSOLE_TTY_ONLY", "false"),
+            LOG_FORMAT=env.get("LOG_FORMAT", "detailed"),
+            CACHE_EMBEDDINGS=_env_bool(env, "CACHE_EMBEDDINGS", "true"),
+            CACHE_DIR=env.get("CACHE_DIR", ".cache"),
+            MAX_RETRIES=int(env.get("MAX_RETRIES", "3")),
+            RETRY_DELAY=int(env.get("RETRY_DELAY", "2")),
+            ENABLE_TELEMETRY=_env_bool(env, "ENABLE_TELEMETRY", "false"),
+        )
+    
+    def validate(self, require_openai: bool = False) -> bool:
         """
         Validate configuration
         
+        Successful results are cached per ``require_openai`` value until
+        ``reload()`` is called.
+        
         Args:
             require_openai: Whether to require OpenAI configuration
             
@@ -113,152 +234,211 @@ class Config:
         Raises:
             ConfigValidationError: If validation fails
         """
+        self._validate(require_openai)
+        return True
+    
+    @functools.lru_cache(maxsize=4)
+    def _validate(self, require_openai: bool) -> None:
+        """Run validation checks (cached); raises ConfigValidationError on failure"""
         errors = []
         
         # Required fields
-        if not cls.AZURE_SEARCH_ENDPOINT:
+        if not self.AZURE_SEARCH_ENDPOINT:
             errors.append("AZURE_SEARCH_ENDPOINT is required")
-        elif not cls.AZURE_SEARCH_ENDPOINT.startswith("https://"):
+        elif not self.AZURE_SEARCH_ENDPOINT.startswith("https://"):
             errors.append("AZURE_SEARCH_ENDPOINT must start with https://")
             
-        if not cls.AZURE_SEARCH_KEY:
+        if not self.AZURE_SEARCH_KEY:
             errors.append("AZURE_SEARCH_KEY is required")
             
-        if not cls.FILE_SHARE_PATH:
+        if not self.FILE_SHARE_PATH:
             errors.append("FILE_SHARE_PATH is required")
-        elif cls.FILE_SHARE_PATH and not os.path.exists(cls.FILE_SHARE_PATH):
-            errors.append(f"FILE_SHARE_PATH does not exist: {cls.FILE_SHARE_PATH}")
+        elif self.FILE_SHARE_PATH and not os.path.exists(self.FILE_SHARE_PATH):
+            errors.append(f"FILE_SHARE_PATH does not exist: {self.FILE_SHARE_PATH}")
             
         # OpenAI validation (if required)
         if require_openai:
-            if not cls.AZURE_OPENAI_ENDPOINT:
+            if not self.AZURE_OPENAI_ENDPOINT:
                 errors.append("AZURE_OPENAI_ENDPOINT is required for vector search")
-            if not cls.AZURE_OPENAI_KEY:
+            if not self.AZURE_OPENAI_KEY:
                 errors.append("AZURE_OPENAI_KEY is required for vector search")
                 
         # Value validation
-        if cls.CHUNK_SIZE < 100 or cls.CHUNK_SIZE > 8000:
+        if self.CHUNK_SIZE < 100 or self.CHUNK_SIZE > 8000:
             errors.append("CHUNK_SIZE must be between 100 and 8000")
             
-        if cls.CHUNK_OVERLAP >= cls.CHUNK_SIZE:
+        if self.CHUNK_OVERLAP >= self.CHUNK_SIZE:
             errors.append("CHUNK_OVERLAP must be less than CHUNK_SIZE")
             
-        if cls.BATCH_SIZE < 1 or cls.BATCH_SIZE > 1000:
+        if self.BATCH_SIZE < 1 or self.BATCH_SIZE > 1000:
             errors.append("BATCH_SIZE must be between 1 and 1000")
             
-        if cls.MAX_WORKERS < 1 or cls.MAX_WORKERS > 32:
+        if self.MAX_WORKERS < 1 or self.MAX_WORKERS > 32:
             errors.append("MAX_WORKERS must be between 1 and 32")
             
-        if cls.EMBEDDING_DIMENSIONS not in [1536, 3072]:
+        if self.UPLOAD_CONCURRENCY < 1 or self.UPLOAD_CONCURRENCY > 32:
+            errors.append("UPLOAD_CONCURRENCY must be between 1 and 32")
+            
+        if self.EMBEDDING_DIMENSIONS not in [1536, 3072]:
             errors.append("EMBEDDING_DIMENSIONS must be 1536 or 3072")
             
         if errors:
             raise ConfigValidationError("Configuration validation failed:\n  - " + "\n  - ".join(errors))
-        
-        return True
     
-    @classmethod
-    def to_dict(cls, mask_secrets: bool = True) -> Dict[str, Any]:
+    def to_dict(self, mask_secrets: bool = True) -> Mapping[str, Any]:
         """
         Convert configuration to dictionary
         
+        The result is cached per ``mask_secrets`` value and returned as a
+        read-only mapping; call ``reload()`` after changing settings.
+        
         Args:
             mask_secrets: Whether to mask sensitive values
             
         Returns:
-            Configuration dictionary
+            Read-only configuration mapping
         """
-        def mask(value: str) -> str:
-            if not value or not mask_secrets:
-                return value
-            if len(value) <= 12:
-                return "***"
-            return f"{value[:8]}...{value[-4:]}"
-        
-        return {
-            "environment": cls.ENVIRONMENT,
+        return self._build_dict(mask_secrets)
+    
+    @functools.lru_cache(maxsize=2)
+    def _build_dict(self, mask_secrets: bool) -> Mapping[str, Any]:
+        """Build the (cached) configuration mapping"""
+        sections = {
             "azure_search": {
-                "endpoint": cls.AZURE_SEARCH_ENDPOINT,
-                "key": mask(cls.AZURE_SEARCH_KEY),
-                "index_name": cls.AZURE_SEARCH_INDEX_NAME,
-                "vector_index_name": cls.AZURE_SEARCH_VECTOR_INDEX_NAME,
-                "api_version": cls.AZURE_SEARCH_API_VERSION,
+                "endpoint": self.AZURE_SEARCH_ENDPOINT,
+                "key": _mask(self.AZURE_SEARCH_KEY, mask_secrets),
+                "index_name": self.AZURE_SEARCH_INDEX_NAME,
+                "vector_index_name": self.AZURE_SEARCH_VECTOR_INDEX_NAME,
+                "api_version": self.AZURE_SEARCH_API_VERSION,
             },
             "azure_openai": {
-                "endpoint": cls.AZURE_OPENAI_ENDPOINT,
-                "key": mask(cls.AZURE_OPENAI_KEY),
-                "embedding_deployment": cls.AZURE_OPENAI_EMBEDDING_DEPLOYMENT,
-                "chat_deployment": cls.AZURE_OPENAI_CHAT_DEPLOYMENT,
-                "api_version": cls.AZURE_OPENAI_API_VERSION,
-                "embedding_dimensions": cls.EMBEDDING_DIMENSIONS,
+                "endpoint": self.AZURE_OPENAI_ENDPOINT,
+                "key": _mask(self.AZURE_OPENAI_KEY, mask_secrets),
+                "embedding_deployment": self.AZURE_OPENAI_EMBEDDING_DEPLOYMENT,
+                "chat_deployment": self.AZURE_OPENAI_CHAT_DEPLOYMENT,
+                "api_version": self.AZURE_OPENAI_API_VERSION,
+                "embedding_dimensions": self.EMBEDDING_DIMENSIONS,
             },
             "file_share": {
-                "path": cls.FILE_SHARE_PATH,
-                "supported_extensions": cls.SUPPORTED_EXTENSIONS,
-                "exclude_directories": cls.EXCLUDE_DIRECTORIES,
-                "max_file_size_mb": cls.MAX_FILE_SIZE_MB,
+                "path": self.FILE_SHARE_PATH,
+                "supported_extensions": tuple(sorted(self.SUPPORTED_EXTENSIONS)),
+                "exclude_directories": tuple(sorted(self.EXCLUDE_DIRECTORIES)),
+                "max_file_size_mb": self.MAX_FILE_SIZE_MB,
             },
             "indexing": {
-                "chunk_size": cls.CHUNK_SIZE,
-                "chunk_overlap": cls.CHUNK_OVERLAP,
-                "batch_size": cls.BATCH_SIZE,
-                "max_workers": cls.MAX_WORKERS,
-                "incremental": cls.INCREMENTAL_INDEXING,
+                "chunk_size": self.CHUNK_SIZE,
+                "chunk_overlap": self.CHUNK_OVERLAP,
+                "batch_size": self.BATCH_SIZE,
+                "autotune_batch": self.AUTOTUNE_BATCH,
+                "max_workers": self.MAX_WORKERS,
+                "upload_concurrency": self.UPLOAD_CONCURRENCY,
+                "incremental": self.INCREMENTAL_INDEXING,
             },
             "search": {
-                "default_top_k": cls.DEFAULT_TOP_K,
-                "semantic_reranking": cls.ENABLE_SEMANTIC_RERANKING,
-                "min_relevance_score": cls.MIN_RELEVANCE_SCORE,
+                "default_top_k": self.DEFAULT_TOP_K,
+                "semantic_reranking": self.ENABLE_SEMANTIC_RERANKING,
+                "min_relevance_score": self.MIN_RELEVANCE_SCORE,
             },
             "logging": {
-                "level": cls.LOG_LEVEL,
-                "file": cls.LOG_FILE,
-                "console": cls.LOG_TO_CONSOLE,
-                "format": cls.LOG_FORMAT,
+                "level": self.LOG_LEVEL,
+                "file": self.LOG_FILE,
+                "console": self.LOG_TO_CONSOLE,
+                "console_tty_only": self.LOG_TO_CONSOLE_TTY_ONLY,
+                "format": self.LOG_FORMAT,
             },
             "performance": {
-                "cache_embeddings": cls.CACHE_EMBEDDINGS,
-                "cache_dir": cls.CACHE_DIR,
-                "max_retries": cls.MAX_RETRIES,
-                "retry_delay": cls.RETRY_DELAY,
+                "cache_embeddings": self.CACHE_EMBEDDINGS,
+                "cache_dir": self.CACHE_DIR,
+                "max_retries": self.MAX_RETRIES,
+                "retry_delay": self.RETRY_DELAY,
             }
         }
+        
+        config_dict = {"environment": self.ENVIRONMENT}
+        config_dict.update(
+            (name, MappingProxyType(values)) for name, values in sections.items()
+        )
+        return MappingProxyType(config_dict)
     
-    @classmethod
-    def print_config(cls, mask_secrets: bool = True):
-        """Print configuration in formatted output"""
-        config_dict = cls.to_dict(mask_secrets=mask_secrets)
+    def reload(self) -> "_Config":
+        """
+        Re-read environment variables and refresh settings in place
         
-        print("=" * 80)
-        print("CONFIGURATION")
-        print("=" * 80)
-        print(f"\nEnvironment: {config_dict['environment'].upper()}\n")
+        Existing references to ``Config`` see the new values, and cached
+        views such as ``to_dict()`` are invalidated.
+        
+        Returns:
+            The refreshed configuration
+        """
+        fresh = type(self).from_env()
+        for field in fields(self):
+            object.__setattr__(self, field.name, getattr(fresh, field.name))
+        type(self)._build_dict.cache_clear()
+        type(self)._validate.cache_clear()
+        return self
+    
+    def print_config(self, mask_secrets: bool = True):
+        """
+        Print configuration in formatted output
+        
+        The dump is informational, so it is skipped when LOG_LEVEL is
+        WARNING or higher. Output is built in memory and written once.
+        """
+        if self.LOG_LEVEL.upper() in _QUIET_LOG_LEVELS:
+            return
+        
+        config_dict = self.to_dict(mask_secrets=mask_secrets)
+        
+        buf = io.StringIO()
+        buf.write("=" * 80 + "\n")
+        buf.write("CONFIGURATION\n")
+        buf.write("=" * 80 + "\n")
+        buf.write(f"\nEnvironment: {config_dict['environment'].upper()}\n\n")
         
         for section, values in config_dict.items():
             if section == "environment":
                 continue
                 
-            print(f"\n{section.replace('_', ' ').title()}:")
+            buf.write(f"\n{section.replace('_', ' ').title()}:\n")
             for key, value in values.items():
-                if isinstance(value, list):
-                    print(f"  {key}: {', '.join(str(v) for v in value)}")
+                if isinstance(value, (list, tuple)):
+                    buf.write(f"  {key}: {', '.join(str(v) for v in value)}\n")
                 else:
-                    print(f"  {key}: {value}")
+                    buf.write(f"  {key}: {value}\n")
         
-        print("\n" + "=" * 80)
+        buf.write("\n" + "=" * 80 + "\n")
+        sys.stdout.write(buf.getvalue())
     
-    @classmethod
-    def save_config(cls, filepath: str = "config.json", mask_secrets: bool = True):
-        """Save configuration to JSON file"""
-        config_dict = cls.to_dict(mask_secrets=mask_secrets)
-        with open(filepath, 'w') as f:
-            json.dump(config_dict, f, indent=2)
+    def save_config(self, filepath: str = "config.json", mask_secrets: bool = True):
+        """Save configuration to JSON file (uses orjson when installed)"""
+        config_dict = self.to_dict(mask_secrets=mask_secrets)
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(
+                    config_dict,
+                    default=dict,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+                ))
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(config_dict, f, indent=2, sort_keys=True, default=dict)
         print(f"Configuration saved to {filepath}")
 
 
-# Auto-validate on import (warning only)
-try:
-    Config.validate(require_openai=False)
-except ConfigValidationError as e:
-    print(f"⚠️  Configuration Warning: {e}")
-    print("Please ensure your .env file is properly configured before running.")
\ No newline at end of file
+@functools.lru_cache(maxsize=1)
+def _load_config() -> _Config:
+    """Load the .env file and build the process-wide configuration once"""
+    _load_dotenv()
+    return _Config.from_env()
+
+
+Config = _load_config()
+
+
+# Auto-validate on import (warning only; skipped in production)
+if Config.ENVIRONMENT != "production":
+    try:
+        Config.validate(require_openai=False)
+    except ConfigValidationError as e:
+        print(f"⚠️  Configuration Warning: {e}")
+        print("Please ensure your .env file is properly configured before running.")
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Shared HTTP session and Azure SDK transport
+Author: Edgar McOchieng
+"""
+
+import functools
+import random
+from typing import Optional
+
+from .settings import Config
+
+# HTTP statuses worth retrying: throttling and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Longest wait between retries, in seconds
+MAX_RETRY_WAIT = 60
+
+
+@functools.lru_cache(maxsize=1)
+def get_http_session():
+    """
+    Get the process-wide requests session
+
+    The connection pool is sized from MAX_WORKERS so concurrent calls
+    reuse keep-alive connections instead of opening new ones.
+
+    Returns:
+        Shared requests.Session
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=Config.MAX_WORKERS,
+        pool_maxsize=Config.MAX_WORKERS * 2
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@functools.lru_cache(maxsize=1)
+def get_http_transport():
+    """
+    Get the process-wide Azure SDK transport built on the shared session
+
+    Pass as ``transport=`` when constructing Azure SDK clients. Closing a
+    client does not close the shared session.
+
+    Returns:
+        Shared RequestsTransport
+    """
+    from azure.core.pipeline.transport import RequestsTransport
+
+    return RequestsTransport(session=get_http_session(), session_owner=False)
+
+
+def retry_wait(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Seconds to wait before retrying a throttled or failed request
+
+    Honors a Retry-After header given in seconds. Otherwise backs off
+    exponentially from RETRY_DELAY with equal jitter, so concurrent
+    clients do not retry in lockstep.
+
+    Args:
+        attempt: Zero-based number of the attempt that failed
+        retry_after: Retry-After header value, if any
+
+    Returns:
+        Seconds to wait, at most MAX_RETRY_WAIT
+    """
+    if retry_after:
+        try:
+            return min(float(retry_after), MAX_RETRY_WAIT)
+        except ValueError:
+            pass  # HTTP-date form; fall back to backoff
+
+    backoff = min(Config.RETRY_DELAY * (2 ** attempt), MAX_RETRY_WAIT)
+    return backoff / 2 + random.uniform(0, backoff / 2)
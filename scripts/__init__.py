@@ -0,0 +1,6 @@
+"""
+Command-line scripts for AzureSearch FileShare Indexer
+
+Installed as console entry points (see setup.py), or run directly with
+``python scripts/<name>.py`` / ``python -m scripts.<name>``.
+"""
@@ -0,0 +1,49 @@
+"""
+Shared startup steps for the command-line scripts
+
+Author: Edgar McOchieng
+"""
+
+from typing import Optional
+
+from config import Config
+
+
+def print_banner(title: str):
+    """Print a script banner"""
+    print("=" * 80)
+    print(title)
+    print("=" * 80)
+    print()
+
+
+def bootstrap(require_openai: bool = False, banner: Optional[str] = None, show_config: bool = True) -> Optional[int]:
+    """
+    Run the common script preamble: banner, configuration check and dump
+
+    Args:
+        require_openai: Whether Azure OpenAI settings are required
+        banner: Banner title to print first (skipped if None)
+        show_config: Whether to print the configuration after validating
+
+    Returns:
+        None if the script should continue, otherwise the exit code
+    """
+    if banner:
+        print_banner(banner)
+
+    # Validate configuration
+    try:
+        Config.validate(require_openai=require_openai)
+    except Exception as e:
+        print(f"❌ Configuration error: {e}")
+        if require_openai:
+            print("\nPlease ensure Azure OpenAI configuration is set in .env file")
+        return 1
+
+    # Print configuration
+    if show_config:
+        Config.print_config()
+        print()
+
+    return None
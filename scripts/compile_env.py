@@ -0,0 +1,56 @@
+"""
+Compile the .env file into a Python module for faster startup
+
+Writes config/_env_cache.py containing the parsed .env values. Config
+loads it instead of parsing .env while the cache is newer than the .env
+file. Re-run after editing .env (a stale cache is ignored automatically).
+
+Author: Edgar McOchieng
+"""
+
+import sys
+import os
+
+# Running as a loose file (python scripts/...) needs the project root on
+# sys.path; installed entry points and `python -m scripts...` do not
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+from pprint import pformat
+from dotenv import dotenv_values, find_dotenv
+
+DEFAULT_OUTPUT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "_env_cache.py"
+)
+
+
+def main():
+    """Compile .env into config/_env_cache.py"""
+    parser = argparse.ArgumentParser(description="Compile .env into a Python module")
+    parser.add_argument("--env-file", type=str, help="Path to .env file (default: nearest .env)")
+    parser.add_argument("--output", type=str, default=DEFAULT_OUTPUT, help="Output module path")
+
+    args = parser.parse_args()
+
+    env_file = args.env_file or find_dotenv(usecwd=True)
+    if not env_file or not os.path.isfile(env_file):
+        print("❌ No .env file found")
+        return 1
+
+    env_file = os.path.abspath(env_file)
+    values = {key: value for key, value in dotenv_values(env_file).items() if value is not None}
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write('"""\nCompiled .env cache generated by scripts/compile_env.py -- do not edit\n"""\n\n')
+        f.write(f"ENV_FILE = {env_file!r}\n")
+        f.write(f"MTIME = {os.path.getmtime(env_file)!r}\n")
+        f.write(f"ENV = {pformat(values)}\n")
+
+    print(f"✅ Compiled {len(values)} settings from {env_file}")
+    print(f"   Output: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,28 +6,23 @@ Author: Edgar McOchieng
 
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.index_manager import IndexManager
+# Running as a loose file (python scripts/...) needs the project root on
+# sys.path; installed entry points and `python -m scripts...` do not
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from config import Config
+from scripts._common import bootstrap
 
 def main():
     """Create standard index"""
-    print("=" * 80)
-    print("CREATE STANDARD TEXT SEARCH INDEX")
-    print("=" * 80)
-    print()
-    
-    # Validate configuration
-    try:
-        Config.validate(require_openai=False)
-    except Exception as e:
-        print(f"❌ Configuration error: {e}")
-        return 1
+    exit_code = bootstrap(require_openai=False, banner="CREATE STANDARD TEXT SEARCH INDEX")
+    if exit_code is not None:
+        return exit_code
     
-    # Print configuration
-    Config.print_config()
-    print()
+    # Imported here so --help and config errors skip loading Azure SDK clients
+    from src.index_manager import IndexManager
     
     # Create index
     manager = IndexManager()
@@ -6,10 +6,14 @@ Author: Edgar McOchieng
 
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.indexer import FileIndexer
+# Running as a loose file (python scripts/...) needs the project root on
+# sys.path; installed entry points and `python -m scripts...` do not
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from config import Config
+from scripts._common import bootstrap
 import argparse
 
 def main():
@@ -21,21 +25,12 @@ def main():
     
     args = parser.parse_args()
     
-    print("=" * 80)
-    print("FILE SHARE INDEXER - STANDARD TEXT SEARCH")
-    print("=" * 80)
-    print()
-    
-    # Validate configuration
-    try:
-        Config.validate(require_openai=False)
-    except Exception as e:
-        print(f"❌ Configuration error: {e}")
-        return 1
+    exit_code = bootstrap(require_openai=False, banner="FILE SHARE INDEXER - STANDARD TEXT SEARCH")
+    if exit_code is not None:
+        return exit_code
     
-    # Print configuration
-    Config.print_config()
-    print()
+    # Imported here so --help and config errors skip loading Azure SDK clients
+    from src.indexer import FileIndexer
     
     # Create indexer
     indexer = FileIndexer()
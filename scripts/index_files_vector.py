@@ -6,10 +6,14 @@ Author: Edgar McOchieng
 
 import sys
 import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.vector_indexer import VectorIndexer
+# Running as a loose file (python scripts/...) needs the project root on
+# sys.path; installed entry points and `python -m scripts...` do not
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from config import Config
+from scripts._common import bootstrap
 import argparse
 
 
@@ -19,35 +23,31 @@ def main():
     parser.add_argument("--path", type=str, help="Path to file share (overrides config)")
     parser.add_argument("--recursive", action="store_true", default=True, help="Index subdirectories")
     parser.add_argument("--no-progress", action="store_true", help="Disable progress bar")
+    parser.add_argument("--batch", action="store_true",
+                        help="Embed with the Azure OpenAI Batch API (cheaper, may take hours)")
     
     args = parser.parse_args()
     
-    print("=" * 80)
-    print("FILE SHARE INDEXER - VECTOR EMBEDDINGS")
-    print("=" * 80)
-    print()
-    
-    # Validate configuration
-    try:
-        Config.validate(require_openai=True)
-    except Exception as e:
-        print(f"❌ Configuration error: {e}")
-        return 1
+    exit_code = bootstrap(require_openai=True, banner="FILE SHARE INDEXER - VECTOR EMBEDDINGS")
+    if exit_code is not None:
+        return exit_code
     
-    # Print configuration
-    Config.print_config()
-    print()
+    # Imported here so --help and config errors skip loading Azure SDK clients
+    from src.vector_indexer import VectorIndexer
     
     # Create indexer
     indexer = VectorIndexer()
     
     # Run indexing
     path = args.path or Config.FILE_SHARE_PATH
-    stats = indexer.index_directory(
-        directory_path=path,
-        recursive=args.recursive,
-        show_progress=not args.no_progress
-    )
+    if args.batch:
+        stats = indexer.index_directory_batch(directory_path=path, recursive=args.recursive)
+    else:
+        stats = indexer.index_directory(
+            directory_path=path,
+            recursive=args.recursive,
+            show_progress=not args.no_progress
+        )
     
     print("\n✨ Vector indexing complete!")
     return 0
@@ -9,36 +9,35 @@ Author: Edgar McOchieng
 
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Running as a loose file (python scripts/...) needs the project root on
+# sys.path; installed entry points and `python -m scripts...` do not
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import argparse
-from src.index_manager import IndexManager
-from config import Config
+from scripts._common import bootstrap
 
 def list_indexes(manager):
     """List all indexes"""
     print("\n📋 Listing all indexes...")
-    indexes = manager.list_indexes()
+    all_stats = manager.get_all_index_statistics()
     
-    if not indexes:
+    if not all_stats:
         print("No indexes found")
         return
     
-    print(f"\nFound {len(indexes)} indexes:\n")
-    for i, index_name in enumerate(indexes, 1):
+    print(f"\nFound {len(all_stats)} indexes:\n")
+    for i, (index_name, stats) in enumerate(all_stats.items(), 1):
         print(f"{i}. {index_name}")
         
-        # Get statistics
-        try:
-            stats = manager.get_index_statistics(index_name)
-            if stats:
-                doc_count = stats.get('documentCount', 'N/A')
-                storage = stats.get('storageSize', 0)
-                storage_mb = storage / (1024 * 1024) if storage else 0
-                print(f"   Documents: {doc_count}")
-                print(f"   Storage: {storage_mb:.2f} MB")
-        except:
-            pass
+        # Print statistics
+        if stats:
+            doc_count = stats.get('documentCount', 'N/A')
+            storage = stats.get('storageSize', 0)
+            storage_mb = storage / (1024 * 1024) if storage else 0
+            print(f"   Documents: {doc_count}")
+            print(f"   Storage: {storage_mb:.2f} MB")
         print()
 
 def create_index(manager, args):
@@ -153,13 +152,14 @@ Examples:
         return 1
     
     # Initialize manager
-    try:
-        Config.validate(require_openai=False)
-    except Exception as e:
-        print(f"❌ Configuration error: {e}")
-        return 1
+    exit_code = bootstrap(require_openai=False, show_config=False)
+    if exit_code is not None:
+        return exit_code
+    
+    # Imported here so --help and config errors skip loading Azure SDK clients
+    from src.index_manager import get_manager
     
-    manager = IndexManager()
+    manager = get_manager()
     
     # Execute command
     try:
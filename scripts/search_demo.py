@@ -6,9 +6,12 @@ Author: Edgar McOchieng
 
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.search import SearchClient
+# Running as a loose file (python scripts/...) needs the project root on
+# sys.path; installed entry points and `python -m scripts...` do not
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from config import Config
 import argparse
 
@@ -37,6 +40,9 @@ def main():
     print("=" * 80)
     print()
     
+    # Imported here so --help skips loading Azure SDK clients
+    from src.search import SearchClient
+    
     # Create search client
     search = SearchClient()
     
@@ -30,7 +30,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/edgarochieng/AzureSearch-FileShare-Indexer",
-    packages=find_packages(include=['src', 'src.*', 'config', 'config.*']),
+    packages=find_packages(include=['src', 'src.*', 'config', 'config.*', 'scripts', 'scripts.*']),
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -63,6 +63,10 @@ setup(
             'Pillow>=10.0.0',
             'markdown>=3.5.1',
             'pytesseract>=0.3.10',
+            'zstandard>=0.22.0',
+            'orjson>=3.9.0',
+            'pymupdf>=1.23.0',
+            'pypdfium2>=4.0.0',
         ],
     },
     entry_points={
@@ -73,6 +77,7 @@ setup(
             'azs-create-vector-index=scripts.create_vector_index:main',
             'azs-manage-indexes=scripts.manage_indexes:main',
             'azs-search=scripts.search_demo:main',
+            'azs-compile-env=scripts.compile_env:main',
         ],
     },
     keywords='azure search indexing vector-embeddings semantic-search openai documents',
@@ -31,11 +31,43 @@ __all__ = [
     "VectorIndexer",
     "SearchClient",
     "ContentExtractor",
+    "FileContext",
     "IndexManager",
 ]
 
-from .indexer import FileIndexer
-from .vector_indexer import VectorIndexer
-from .search import SearchClient
-from .extractors import ContentExtractor
-from .index_manager import IndexManager
\ No newline at end of file
+import importlib
+from typing import TYPE_CHECKING
+
+# Public names and the submodules defining them. Submodules are imported on
+# first access (PEP 562), so `from src import IndexManager` does not load
+# the OpenAI, Azure SDK and document libraries used by the others.
+_LAZY = {
+    "FileIndexer": ".indexer",
+    "VectorIndexer": ".vector_indexer",
+    "SearchClient": ".search",
+    "ContentExtractor": ".extractors",
+    "FileContext": ".extractors",
+    "IndexManager": ".index_manager",
+}
+
+if TYPE_CHECKING:
+    from .indexer import FileIndexer
+    from .vector_indexer import VectorIndexer
+    from .search import SearchClient
+    from .extractors import ContentExtractor, FileContext
+    from .index_manager import IndexManager
+
+
+def __getattr__(name):
+    """Import a public name from its submodule on first access"""
+    if name in _LAZY:
+        module = importlib.import_module(_LAZY[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """List module attributes, including names not yet imported"""
+    return sorted(set(globals()) | set(_LAZY))
\ No newline at end of file
@@ -4,14 +4,121 @@ Index management utilities for creating and managing Azure AI Search indexes
 Author: Edgar McOchieng
 """
 
+import functools
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, List, Any
-from config import Config
+from config import Config, RETRY_STATUSES, get_http_session, retry_wait
 from config.logger import get_logger
 
+try:
+    import orjson
+except ImportError:  # optional: request bodies fall back to requests' json encoding
+    orjson = None
+
 logger = get_logger(__name__)
 
 
+# Index schemas, built once at import. Request bodies reference these
+# objects directly, so they must not be mutated.
+
+# Fields of the standard text index
+_STANDARD_INDEX_FIELDS = [
+    {"name": "id", "type": "Edm.String", "key": True, "searchable": False},
+    {"name": "content", "type": "Edm.String", "searchable": True, "analyzer": "en.microsoft"},
+    {"name": "title", "type": "Edm.String", "searchable": True, "filterable": True, "sortable": True},
+    {"name": "name", "type": "Edm.String", "searchable": True, "filterable": True},
+    {"name": "filePath", "type": "Edm.String", "searchable": True, "filterable": True},
+    {"name": "extension", "type": "Edm.String", "filterable": True, "facetable": True},
+    {"name": "size", "type": "Edm.Int64", "filterable": True, "sortable": True},
+    {"name": "createdDateTime", "type": "Edm.DateTimeOffset", "filterable": True, "sortable": True},
+    {"name": "modifiedDateTime", "type": "Edm.DateTimeOffset", "filterable": True, "sortable": True},
+    {"name": "createdBy", "type": "Edm.String", "filterable": True, "facetable": True},
+    {"name": "lastModifiedBy", "type": "Edm.String", "filterable": True, "facetable": True},
+    {"name": "fileType", "type": "Edm.String", "filterable": True, "facetable": True},
+    {"name": "url", "type": "Edm.String", "searchable": False}
+]
+
+# Fields of the vector index (contentVector dimensions are set per index)
+_VECTOR_INDEX_FIELDS = [
+    # Key field
+    {"name": "id", "type": "Edm.String", "key": True, "searchable": False},
+
+    # Content fields
+    {"name": "content", "type": "Edm.String", "searchable": True, "analyzer": "en.microsoft"},
+    {"name": "chunk", "type": "Edm.String", "searchable": True, "analyzer": "en.microsoft"},
+
+    # Vector field
+    {
+        "name": "contentVector",
+        "type": "Collection(Edm.Single)",
+        "searchable": True,
+        "dimensions": None,  # set per index
+        "vectorSearchProfile": "vector-profile"
+    },
+
+    # Metadata fields
+    {"name": "title", "type": "Edm.String", "searchable": True, "filterable": True, "sortable": True},
+    {"name": "name", "type": "Edm.String", "searchable": True, "filterable": True},
+    {"name": "filePath", "type": "Edm.String", "searchable": True, "filterable": True},
+    {"name": "extension", "type": "Edm.String", "filterable": True, "facetable": True},
+    {"name": "size", "type": "Edm.Int64", "filterable": True, "sortable": True},
+    {"name": "createdDateTime", "type": "Edm.DateTimeOffset", "filterable": True, "sortable": True},
+    {"name": "modifiedDateTime", "type": "Edm.DateTimeOffset", "filterable": True, "sortable": True},
+    {"name": "createdBy", "type": "Edm.String", "filterable": True, "facetable": True},
+    {"name": "lastModifiedBy", "type": "Edm.String", "filterable": True, "facetable": True},
+    {"name": "fileType", "type": "Edm.String", "filterable": True, "facetable": True},
+    {"name": "url", "type": "Edm.String", "searchable": False},
+
+    # Chunk metadata
+    {"name": "chunkNumber", "type": "Edm.Int32", "filterable": True, "sortable": True},
+    {"name": "totalChunks", "type": "Edm.Int32", "filterable": True}
+]
+
+# Vector search configuration
+_VECTOR_SEARCH_CONFIG = {
+    "algorithms": [
+        {
+            "name": "hnsw-algorithm",
+            "kind": "hnsw",
+            "hnswParameters": {
+                "metric": "cosine",
+                "m": 4,
+                "efConstruction": 400,
+                "efSearch": 500
+            }
+        }
+    ],
+    "profiles": [
+        {
+            "name": "vector-profile",
+            "algorithm": "hnsw-algorithm"
+        }
+    ]
+}
+
+# Semantic search configuration
+_SEMANTIC_CONFIG = {
+    "configurations": [
+        {
+            "name": "semantic-config",
+            "prioritizedFields": {
+                "titleField": {"fieldName": "title"},
+                "prioritizedContentFields": [
+                    {"fieldName": "chunk"},
+                    {"fieldName": "content"}
+                ],
+                "prioritizedKeywordsFields": [
+                    {"fieldName": "name"},
+                    {"fieldName": "extension"}
+                ]
+            }
+        }
+    ]
+}
+
+
 class IndexManager:
     """
     Manage Azure AI Search indexes
@@ -35,6 +142,68 @@ class IndexManager:
             "api-key": self.api_key
         }
     
+    @functools.cached_property
+    def session(self) -> requests.Session:
+        """Process-wide HTTP session, resolved on first use so connections stay alive"""
+        return get_http_session()
+    
+    def __enter__(self) -> "IndexManager":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """
+        Release idle pooled connections
+        
+        The session is shared, so it stays usable afterwards; later requests
+        simply open new connections.
+        """
+        if "session" in self.__dict__:
+            self.session.close()
+    
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request, retrying throttled and transient failures
+        
+        Retries 429/5xx responses and connection errors up to MAX_RETRIES
+        attempts in total, honoring Retry-After and otherwise backing off
+        exponentially from RETRY_DELAY with jitter. JSON bodies are encoded
+        with orjson when it is installed.
+        
+        Args:
+            method: Session method name ('get', 'post', 'delete')
+            url: Request URL
+            **kwargs: Passed through to the session method
+            
+        Returns:
+            The last response received
+        """
+        send = getattr(self.session, method)
+        attempts = max(1, Config.MAX_RETRIES)
+        
+        # Encode JSON bodies once (the Content-Type header is already set)
+        if orjson is not None and "json" in kwargs:
+            kwargs["data"] = orjson.dumps(kwargs.pop("json"))
+        
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                response = send(url, headers=self.headers, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    raise
+                wait = retry_wait(attempt)
+                logger.warning(f"{method.upper()} {url} failed ({e}), retrying in {wait:.1f}s")
+            else:
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    return response
+                wait = retry_wait(attempt, response.headers.get("Retry-After"))
+                logger.warning(f"{method.upper()} {url} returned {response.status_code}, retrying in {wait:.1f}s")
+            
+            time.sleep(wait)
+    
     def create_standard_index(self, index_name: Optional[str] = None) -> bool:
         """
         Create a standard text search index
@@ -51,27 +220,13 @@ class IndexManager:
         
         index_definition = {
             "name": index_name,
-            "fields": [
-                {"name": "id", "type": "Edm.String", "key": True, "searchable": False},
-                {"name": "content", "type": "Edm.String", "searchable": True, "analyzer": "en.microsoft"},
-                {"name": "title", "type": "Edm.String", "searchable": True, "filterable": True, "sortable": True},
-                {"name": "name", "type": "Edm.String", "searchable": True, "filterable": True},
-                {"name": "filePath", "type": "Edm.String", "searchable": True, "filterable": True},
-                {"name": "extension", "type": "Edm.String", "filterable": True, "facetable": True},
-                {"name": "size", "type": "Edm.Int64", "filterable": True, "sortable": True},
-                {"name": "createdDateTime", "type": "Edm.DateTimeOffset", "filterable": True, "sortable": True},
-                {"name": "modifiedDateTime", "type": "Edm.DateTimeOffset", "filterable": True, "sortable": True},
-                {"name": "createdBy", "type": "Edm.String", "filterable": True, "facetable": True},
-                {"name": "lastModifiedBy", "type": "Edm.String", "filterable": True, "facetable": True},
-                {"name": "fileType", "type": "Edm.String", "filterable": True, "facetable": True},
-                {"name": "url", "type": "Edm.String", "searchable": False}
-            ]
+            "fields": _STANDARD_INDEX_FIELDS
         }
         
         url = f"{self.endpoint}/indexes?api-version={self.api_version}"
         
         try:
-            response = requests.post(url, headers=self.headers, json=index_definition)
+            response = self._request("post", url, json=index_definition)
             
             if response.status_code in [200, 201]:
                 logger.info(f"✅ Standard index '{index_name}' created successfully")
@@ -108,90 +263,28 @@ class IndexManager:
         logger.info(f"Creating vector index: {index_name}")
         logger.info(f"Vector dimensions: {embedding_dimensions}")
         
+        # Copy only the vector field to set its dimensions; the shared
+        # definitions are never mutated
+        fields = [
+            dict(field, dimensions=embedding_dimensions) if field["name"] == "contentVector" else field
+            for field in _VECTOR_INDEX_FIELDS
+        ]
+        
         index_definition = {
             "name": index_name,
-            "fields": [
-                # Key field
-                {"name": "id", "type": "Edm.String", "key": True, "searchable": False},
-                
-                # Content fields
-                {"name": "content", "type": "Edm.String", "searchable": True, "analyzer": "en.microsoft"},
-                {"name": "chunk", "type": "Edm.String", "searchable": True, "analyzer": "en.microsoft"},
-                
-                # Vector field
-                {
-                    "name": "contentVector",
-                    "type": "Collection(Edm.Single)",
-                    "searchable": True,
-                    "dimensions": embedding_dimensions,
-                    "vectorSearchProfile": "vector-profile"
-                },
-                
-                # Metadata fields
-                {"name": "title", "type": "Edm.String", "searchable": True, "filterable": True, "sortable": True},
-                {"name": "name", "type": "Edm.String", "searchable": True, "filterable": True},
-                {"name": "filePath", "type": "Edm.String", "searchable": True, "filterable": True},
-                {"name": "extension", "type": "Edm.String", "filterable": True, "facetable": True},
-                {"name": "size", "type": "Edm.Int64", "filterable": True, "sortable": True},
-                {"name": "createdDateTime", "type": "Edm.DateTimeOffset", "filterable": True, "sortable": True},
-                {"name": "modifiedDateTime", "type": "Edm.DateTimeOffset", "filterable": True, "sortable": True},
-                {"name": "createdBy", "type": "Edm.String", "filterable": True, "facetable": True},
-                {"name": "lastModifiedBy", "type": "Edm.String", "filterable": True, "facetable": True},
-                {"name": "fileType", "type": "Edm.String", "filterable": True, "facetable": True},
-                {"name": "url", "type": "Edm.String", "searchable": False},
-                
-                # Chunk metadata
-                {"name": "chunkNumber", "type": "Edm.Int32", "filterable": True, "sortable": True},
-                {"name": "totalChunks", "type": "Edm.Int32", "filterable": True}
-            ],
+            "fields": fields,
             
             # Vector search configuration
-            "vectorSearch": {
-                "algorithms": [
-                    {
-                        "name": "hnsw-algorithm",
-                        "kind": "hnsw",
-                        "hnswParameters": {
-                            "metric": "cosine",
-                            "m": 4,
-                            "efConstruction": 400,
-                            "efSearch": 500
-                        }
-                    }
-                ],
-                "profiles": [
-                    {
-                        "name": "vector-profile",
-                        "algorithm": "hnsw-algorithm"
-                    }
-                ]
-            },
+            "vectorSearch": _VECTOR_SEARCH_CONFIG,
             
             # Semantic search configuration
-            "semantic": {
-                "configurations": [
-                    {
-                        "name": "semantic-config",
-                        "prioritizedFields": {
-                            "titleField": {"fieldName": "title"},
-                            "prioritizedContentFields": [
-                                {"fieldName": "chunk"},
-                                {"fieldName": "content"}
-                            ],
-                            "prioritizedKeywordsFields": [
-                                {"fieldName": "name"},
-                                {"fieldName": "extension"}
-                            ]
-                        }
-                    }
-                ]
-            }
+            "semantic": _SEMANTIC_CONFIG
         }
         
         url = f"{self.endpoint}/indexes?api-version={self.api_version}"
         
         try:
-            response = requests.post(url, headers=self.headers, json=index_definition)
+            response = self._request("post", url, json=index_definition)
             
             if response.status_code in [200, 201]:
                 logger.info(f"✅ Vector index '{index_name}' created successfully")
@@ -225,7 +318,7 @@ class IndexManager:
         url = f"{self.endpoint}/indexes/{index_name}?api-version={self.api_version}"
         
         try:
-            response = requests.delete(url, headers=self.headers)
+            response = self._request("delete", url)
             
             if response.status_code in [200, 204]:
                 logger.info(f"✅ Index '{index_name}' deleted successfully")
@@ -253,7 +346,7 @@ class IndexManager:
         url = f"{self.endpoint}/indexes?api-version={self.api_version}"
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self._request("get", url)
             
             if response.status_code == 200:
                 data = response.json()
@@ -283,7 +376,7 @@ class IndexManager:
         url = f"{self.endpoint}/indexes/{index_name}/stats?api-version={self.api_version}"
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self._request("get", url)
             
             if response.status_code == 200:
                 return response.json()
@@ -293,4 +386,38 @@ class IndexManager:
                 
         except Exception as e:
             logger.error(f"Error getting statistics: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def get_all_index_statistics(self, index_names: Optional[List[str]] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get statistics for several indexes concurrently
+        
+        The requests are independent, so they run in parallel over the pooled
+        session and take about one round-trip instead of one per index.
+        
+        Args:
+            index_names: Names of the indexes (defaults to all indexes)
+            
+        Returns:
+            Dictionary mapping index name to statistics (None if failed),
+            in the order of index_names
+        """
+        if index_names is None:
+            index_names = self.list_indexes()
+        if not index_names:
+            return {}
+        
+        max_workers = min(Config.MAX_WORKERS, len(index_names))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(index_names, executor.map(self.get_index_statistics, index_names)))
+
+
+@functools.lru_cache(maxsize=1)
+def get_manager() -> IndexManager:
+    """
+    Get the process-wide IndexManager instance
+    
+    Returns:
+        Shared IndexManager (and its HTTP session)
+    """
+    return IndexManager()
@@ -8,20 +8,50 @@ Author: Edgar McOchieng
 
 import os
 import hashlib
+import queue
+import sqlite3
+import threading
+from itertools import chain, islice
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, as_completed, wait
 from pathlib import Path
-from azure.search.documents import SearchClient
+from azure.search.documents import SearchClient, SearchIndexingBufferedSender
 from azure.core.credentials import AzureKeyCredential
+from azure.core.exceptions import HttpResponseError
 from tqdm import tqdm
 import time
 
-from config import Config
+from config import Config, get_http_transport, retry_wait
 from config.logger import get_logger
-from .extractors import ContentExtractor, ExtractionError
+from .extractors import ContentExtractor, ExtractionError, FileContext
 
 logger = get_logger(__name__)
 
+# Longest content stored per document, in characters
+_MAX_CONTENT_LENGTH = 50000
+
+# Per-document upload statuses the service reports as retryable
+_RETRYABLE_RESULT_STATUSES = frozenset({409, 422, 503})
+
+# Incremental cache updates are committed every this many files
+_CACHE_COMMIT_INTERVAL = 1000
+
+# A progress line is logged every this many files processed
+_PROGRESS_LOG_INTERVAL = 1000
+
+# Files checked against the incremental cache per query
+_CACHE_LOOKUP_BATCH = 500
+
+# Upload batch sizes timed when AUTOTUNE_BATCH is enabled
+_BATCH_SIZE_CANDIDATES = (100, 250, 500, 1000)
+
+# Extracted documents waiting for the upload thread
+_UPLOAD_QUEUE_SIZE = 1000
+
+# Extraction jobs queued per worker process while the directory is walked
+_PENDING_PER_WORKER = 4
+
 
 class FileIndexer:
     """
@@ -50,9 +80,15 @@ class FileIndexer:
         self.search_client = SearchClient(
             endpoint=Config.AZURE_SEARCH_ENDPOINT,
             index_name=self.index_name,
-            credential=AzureKeyCredential(Config.AZURE_SEARCH_KEY)
+            credential=AzureKeyCredential(Config.AZURE_SEARCH_KEY),
+            transport=get_http_transport()
         )
         
+        # Buffered sender batching uploads while a directory is indexed,
+        # and the stat results of the files it has queued
+        self._sender: Optional[SearchIndexingBufferedSender] = None
+        self._queued_file_stats: Dict[str, Optional[os.stat_result]] = {}
+        
         # Initialize content extractor
         self.extractor = ContentExtractor()
         
@@ -67,66 +103,112 @@ class FileIndexer:
             "end_time": None,
         }
         
-        # Incremental indexing cache
-        self.indexed_files_cache = {}
+        # Guards the statistics and the cache database, since upload
+        # results may be recorded from the sender's flush thread
+        self._lock = threading.Lock()
+        
+        # Incremental indexing cache (file path -> indexed mtime)
+        self._cache_db: Optional[sqlite3.Connection] = None
+        self._pending_cache_writes = 0
         if Config.INCREMENTAL_INDEXING:
-            self._load_indexed_files_cache()
+            self._open_indexed_files_cache()
     
-    def _load_indexed_files_cache(self):
-        """Load cache of previously indexed files"""
-        cache_file = Path(Config.CACHE_DIR) / f"{self.index_name}_cache.txt"
+    def _open_indexed_files_cache(self):
+        """Open the SQLite cache of previously indexed files
         
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'r') as f:
-                    for line in f:
-                        path, mtime = line.strip().split('|')
-                        self.indexed_files_cache[path] = float(mtime)
-                logger.info(f"Loaded {len(self.indexed_files_cache)} cached entries")
-            except Exception as e:
-                logger.warning(f"Could not load cache: {e}")
+        Each file is a row keyed by path, so lookups and updates touch one
+        row instead of loading and rewriting the whole cache. A cache left
+        by the earlier text format is imported on first open.
+        """
+        cache_dir = Path(Config.CACHE_DIR)
+        
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            self._cache_db = sqlite3.connect(cache_dir / f"{self.index_name}_cache.db", check_same_thread=False)
+            self._cache_db.execute("PRAGMA journal_mode=WAL")
+            self._cache_db.execute("CREATE TABLE IF NOT EXISTS indexed (path TEXT PRIMARY KEY, mtime REAL)")
+            
+            legacy_file = cache_dir / f"{self.index_name}_cache.txt"
+            if legacy_file.exists() and not self._cache_db.execute("SELECT 1 FROM indexed LIMIT 1").fetchone():
+                with open(legacy_file, 'r') as f:
+                    rows = (line.rstrip('\n').rsplit('|', 1) for line in f if '|' in line)
+                    self._cache_db.executemany("INSERT OR REPLACE INTO indexed VALUES (?, ?)", rows)
+                self._cache_db.commit()
+                logger.info(f"Imported indexing cache from {legacy_file}")
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not open cache: {e}")
+            self._cache_db = None
     
-    def _save_indexed_files_cache(self):
-        """Save cache of indexed files"""
-        cache_file = Path(Config.CACHE_DIR) / f"{self.index_name}_cache.txt"
-        cache_file.parent.mkdir(parents=True, exist_ok=True)
+    def _commit_indexed_files_cache(self):
+        """Commit pending cache updates (call with self._lock held)"""
+        if self._cache_db is None or not self._pending_cache_writes:
+            return
         
         try:
-            with open(cache_file, 'w') as f:
-                for path, mtime in self.indexed_files_cache.items():
-                    f.write(f"{path}|{mtime}\n")
-            logger.info("Saved indexing cache")
-        except Exception as e:
+            self._cache_db.commit()
+            self._pending_cache_writes = 0
+        except sqlite3.Error as e:
             logger.warning(f"Could not save cache: {e}")
     
-    def _should_index_file(self, file_path: str) -> bool:
+    def _should_index_file(
+        self,
+        file_path: str,
+        st: Optional[os.stat_result] = None,
+        indexed_mtimes: Optional[Dict[str, float]] = None
+    ) -> bool:
         """Check if file should be indexed based on size and incremental settings
         
         Args:
             file_path: Path to the file to check
+            st: Stat result for the file if already known
+            indexed_mtimes: Cache entries already looked up with
+                _indexed_mtimes() for a batch including this file
             
         Returns:
             True if file should be indexed, False otherwise
         """
+        if st is None:
+            st = os.stat(file_path)
+        
         # Check file size
-        file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
+        file_size_mb = st.st_size / (1024 * 1024)
         if file_size_mb > Config.MAX_FILE_SIZE_MB:
             logger.warning(f"Skipping {file_path}: exceeds max size ({file_size_mb:.2f} MB)")
             return False
         
         # Check if file was already indexed (incremental)
-        if Config.INCREMENTAL_INDEXING:
-            mtime = os.path.getmtime(file_path)
-            cached_mtime = self.indexed_files_cache.get(file_path)
+        if self._cache_db is not None:
+            if indexed_mtimes is None:
+                indexed_mtimes = self._indexed_mtimes([file_path])
             
-            if cached_mtime and mtime <= cached_mtime:
+            indexed_mtime = indexed_mtimes.get(file_path)
+            if indexed_mtime is not None and st.st_mtime <= indexed_mtime:
                 logger.debug(f"Skipping {file_path}: already indexed")
                 self.stats["skipped"] += 1
                 return False
         
         return True
     
-    def _generate_document_id(self, file_path: str) -> str:
+    def _indexed_mtimes(self, file_paths: List[str]) -> Dict[str, float]:
+        """Look up the cached modification times of files in one query
+        
+        Args:
+            file_paths: Paths to look up (at most _CACHE_LOOKUP_BATCH)
+            
+        Returns:
+            Dictionary of path to indexed mtime for the cached paths
+        """
+        if self._cache_db is None or not file_paths:
+            return {}
+        
+        placeholders = ",".join("?" * len(file_paths))
+        with self._lock:
+            return dict(self._cache_db.execute(
+                f"SELECT path, mtime FROM indexed WHERE path IN ({placeholders})", file_paths
+            ))
+    
+    @staticmethod
+    def _generate_document_id(file_path: str) -> str:
         """Generate unique document ID using MD5 hash of file path
         
         Args:
@@ -137,109 +219,233 @@ class FileIndexer:
         """
         return hashlib.md5(file_path.encode()).hexdigest()
     
-    def _prepare_document(self, file_path: str) -> Optional[Dict[str, Any]]:
+    def _prepare_document(self, file_path: Union[str, FileContext]) -> Optional[Dict[str, Any]]:
         """
         Prepare document for indexing
         
         Args:
-            file_path: Path to the file
+            file_path: Path to the file, or its FileContext
             
         Returns:
             Document dictionary or None if preparation fails
         """
-        try:
-            # Extract metadata
-            metadata = self.extractor.extract_metadata(file_path)
-            
-            # Extract content
-            content = self.extractor.extract_text(file_path)
-            
-            # Truncate content if too large
-            max_content_length = 50000  # characters
-            if len(content) > max_content_length:
-                logger.warning(f"Truncating content for {file_path} ({len(content)} chars)")
-                content = content[:max_content_length]
-            
-            # Prepare document
-            document = {
-                "id": self._generate_document_id(file_path),
-                "content": content,
-                "title": metadata.get("document_title") or os.path.splitext(metadata["file_name"])[0],
-                "name": metadata["file_name"],
-                "filePath": file_path,
-                "extension": metadata["file_extension"],
-                "size": metadata["file_size_bytes"],
-                "createdDateTime": metadata["created_time"],
-                "modifiedDateTime": metadata["modified_time"],
-                "createdBy": metadata.get("owner", "Unknown"),
-                "lastModifiedBy": metadata.get("owner", "Unknown"),
-                "fileType": "File",
-                "url": file_path,
-            }
-            
-            # Add document-specific metadata if available
-            if "document_author" in metadata:
-                document["author"] = metadata["document_author"]
-            if "document_keywords" in metadata:
-                document["keywords"] = metadata["document_keywords"]
-            
-            return document
-            
-        except ExtractionError as e:
-            logger.error(f"Failed to prepare document {file_path}: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Unexpected error preparing {file_path}: {e}")
-            return None
+        return _build_document(self.extractor, file_path)
     
     def index_file(self, file_path: str) -> bool:
         """
         Index a single file
         
+        While index_directory() is running the document is queued on the
+        buffered sender and counted once its batch has been uploaded.
+        Otherwise it is uploaded immediately.
+        
         Args:
             file_path: Path to the file
             
         Returns:
-            True if successful, False otherwise
+            True if uploaded (or queued), False otherwise
         """
         try:
-            logger.info(f"Indexing: {os.path.basename(file_path)}")
+            # Per-file messages are DEBUG; lazy arguments are only
+            # evaluated if the message is emitted
+            logger.opt(lazy=True).debug("Indexing: {}", lambda: os.path.basename(file_path))
+            
+            # Stat once for the checks, extraction and statistics
+            ctx = FileContext.from_path(file_path)
             
             # Check if should index
-            if not self._should_index_file(file_path):
+            if not self._should_index_file(file_path, ctx.stat):
                 return False
             
-            # Prepare document
-            document = self._prepare_document(file_path)
+            return self._upload_document(file_path, self._prepare_document(ctx), ctx.stat)
+                
+        except Exception as e:
+            logger.error(f"Error indexing {file_path}: {e}")
+            self._record_result(file_path, False)
+            return False
+    
+    def _upload_document(
+        self,
+        file_path: str,
+        document: Optional[Dict[str, Any]],
+        st: Optional[os.stat_result] = None
+    ) -> bool:
+        """
+        Upload a prepared document, or queue it while a directory is indexed
+        
+        Args:
+            file_path: Path to the file
+            document: Prepared document, or None if preparation failed
+            st: Stat result for the file if already known
+            
+        Returns:
+            True if uploaded (or queued), False otherwise
+        """
+        try:
             if not document:
-                self.stats["failed"] += 1
+                self._record_result(file_path, False)
                 return False
             
+            # Queue for the next batch upload
+            if self._sender is not None:
+                self._queued_file_stats[file_path] = st
+                self._sender.upload_documents(documents=[document])
+                return True
+            
             # Upload to Azure AI Search
-            result = self.search_client.upload_documents(documents=[document])
+            succeeded = self._upload_with_retry(document).succeeded
             
-            if result[0].succeeded:
-                logger.info(f"✅ Successfully indexed: {os.path.basename(file_path)}")
-                self.stats["successful"] += 1
-                
-                # Update cache
-                if Config.INCREMENTAL_INDEXING:
-                    self.indexed_files_cache[file_path] = os.path.getmtime(file_path)
-                
-                # Update size statistics
-                self.stats["total_size_mb"] += os.path.getsize(file_path) / (1024 * 1024)
-                
-                return True
-            else:
+            if not succeeded:
                 logger.error(f"❌ Failed to index: {os.path.basename(file_path)}")
-                self.stats["failed"] += 1
-                return False
+            
+            self._record_result(file_path, succeeded, st)
+            return succeeded
                 
         except Exception as e:
             logger.error(f"Error indexing {file_path}: {e}")
-            self.stats["failed"] += 1
+            self._record_result(file_path, False)
             return False
     
+    def _upload_with_retry(self, document: Dict[str, Any]):
+        """
+        Upload one document, retrying retryable per-document failures
+        
+        The SDK pipeline already retries throttled requests as a whole;
+        this covers documents the service rejects individually (e.g. 503
+        when a partition is throttled) inside an otherwise successful call.
+        
+        Args:
+            document: Prepared document
+            
+        Returns:
+            The IndexingResult of the last attempt
+        """
+        attempts = max(1, Config.MAX_RETRIES)
+        
+        for attempt in range(attempts):
+            result = self.search_client.upload_documents(documents=[document])[0]
+            if result.succeeded or result.status_code not in _RETRYABLE_RESULT_STATUSES or attempt == attempts - 1:
+                return result
+            
+            wait = retry_wait(attempt)
+            logger.warning(f"Upload of {document['name']} returned {result.status_code}, retrying in {wait:.1f}s")
+            time.sleep(wait)
+    
+    def _record_result(self, file_path: str, succeeded: bool, st: Optional[os.stat_result] = None):
+        """Update statistics and the incremental cache for an indexed file
+        
+        Args:
+            file_path: Path to the file
+            succeeded: Whether the file was indexed
+            st: Stat result for the file if already known
+        """
+        with self._lock:
+            self._log_progress()
+            
+            if not succeeded:
+                self.stats["failed"] += 1
+                return
+            
+            logger.opt(lazy=True).debug("✅ Successfully indexed: {}", lambda: os.path.basename(file_path))
+            self.stats["successful"] += 1
+            
+            if st is None:
+                st = os.stat(file_path)
+            
+            # Update cache
+            if self._cache_db is not None:
+                self._cache_db.execute(
+                    "INSERT OR REPLACE INTO indexed VALUES (?, ?)", (file_path, st.st_mtime)
+                )
+                self._pending_cache_writes += 1
+                if self._pending_cache_writes >= _CACHE_COMMIT_INTERVAL:
+                    self._commit_indexed_files_cache()
+            
+            # Update size statistics
+            self.stats["total_size_mb"] += st.st_size / (1024 * 1024)
+    
+    def _log_progress(self):
+        """Log a progress line every _PROGRESS_LOG_INTERVAL files, counting the
+        file being recorded (call with the lock held)"""
+        done = self.stats["successful"] + self.stats["failed"] + 1
+        if done % _PROGRESS_LOG_INTERVAL or self.stats["start_time"] is None:
+            return
+        
+        elapsed = (datetime.now() - self.stats["start_time"]).total_seconds()
+        rate = done / elapsed if elapsed > 0 else 0.0
+        logger.info(f"Processed {done} files ({rate:.1f} files/second)")
+    
+    def _tune_batch_size(self, sample_docs: List[Dict[str, Any]]) -> Optional[int]:
+        """
+        Find the fastest upload batch size by timing a warm-up sample
+        
+        Uploads a batch of n sample documents for each candidate size n
+        and measures documents per second. Each candidate gets its own
+        slice of the sample, so no document is uploaded twice while tuning.
+        Stops at the first size the service rejects (e.g. 413 when the
+        request is too large) or the sample cannot fill.
+        
+        Args:
+            sample_docs: Prepared documents to upload
+            
+        Returns:
+            Best batch size, or None if no candidate could be timed
+        """
+        best_size, best_rate = None, 0.0
+        offset = 0
+        
+        for size in _BATCH_SIZE_CANDIDATES:
+            batch = sample_docs[offset:offset + size]
+            if len(batch) < size:
+                break
+            offset += size
+            
+            start = time.perf_counter()
+            try:
+                self.search_client.upload_documents(documents=batch)
+            except HttpResponseError as e:
+                logger.warning(f"Batch size {size} rejected during tuning: {e.status_code}")
+                break
+            rate = size / max(time.perf_counter() - start, 1e-6)
+            
+            logger.debug(f"Batch size {size}: {rate:.1f} docs/s")
+            if rate > best_rate:
+                best_size, best_rate = size, rate
+        
+        if best_size is not None:
+            logger.info(f"Tuned upload batch size: {best_size}")
+        return best_size
+    
+    def _open_sender(self, batch_size: Optional[int] = None) -> SearchIndexingBufferedSender:
+        """Create a buffered sender that batches uploads and retries failures
+        
+        Args:
+            batch_size: Documents per upload request (defaults to BATCH_SIZE)
+        """
+        return SearchIndexingBufferedSender(
+            endpoint=Config.AZURE_SEARCH_ENDPOINT,
+            index_name=self.index_name,
+            credential=AzureKeyCredential(Config.AZURE_SEARCH_KEY),
+            transport=get_http_transport(),
+            initial_batch_action_count=batch_size or Config.BATCH_SIZE,
+            auto_flush_interval=60,
+            max_retries_per_action=Config.MAX_RETRIES,
+            on_progress=self._on_upload_succeeded,
+            on_error=self._on_upload_failed
+        )
+    
+    def _on_upload_succeeded(self, action):
+        """Buffered sender callback for an uploaded document"""
+        file_path = action.additional_properties["filePath"]
+        self._record_result(file_path, True, self._queued_file_stats.pop(file_path, None))
+    
+    def _on_upload_failed(self, action):
+        """Buffered sender callback for a document that failed to upload"""
+        file_path = action.additional_properties["filePath"]
+        logger.error(f"❌ Failed to index: {os.path.basename(file_path)}")
+        self._queued_file_stats.pop(file_path, None)
+        self._record_result(file_path, False)
+    
     def index_directory(
         self,
         directory_path: Optional[str] = None,
@@ -264,43 +470,75 @@ class FileIndexer:
         
         self.stats["start_time"] = datetime.now()
         
-        # Collect all files to index
-        files_to_index = []
+        # Walk the tree lazily, each file with the stat from its directory
+        # entry, so extraction starts with the first file found
+        self.stats["total_files"] = 0
         
-        if recursive:
-            for root, dirs, files in os.walk(directory_path):
-                # Skip excluded directories
-                dirs[:] = [d for d in dirs if d not in Config.EXCLUDE_DIRECTORIES]
-                
-                for file in files:
-                    ext = os.path.splitext(file)[1].lower()
-                    if ext in Config.SUPPORTED_EXTENSIONS:
-                        files_to_index.append(os.path.join(root, file))
-        else:
-            for file in os.listdir(directory_path):
-                file_path = os.path.join(directory_path, file)
-                if os.path.isfile(file_path):
-                    ext = os.path.splitext(file)[1].lower()
-                    if ext in Config.SUPPORTED_EXTENSIONS:
-                        files_to_index.append(file_path)
+        def files_to_index():
+            files = ContentExtractor.iter_files(
+                directory_path,
+                Config.SUPPORTED_EXTENSIONS,
+                Config.EXCLUDE_DIRECTORIES,
+                recursive
+            )
+            # The incremental cache is queried a batch of files at a time
+            while True:
+                batch = list(islice(files, _CACHE_LOOKUP_BATCH))
+                if not batch:
+                    return
+                self.stats["total_files"] += len(batch)
+                indexed_mtimes = self._indexed_mtimes([ctx.path for ctx in batch])
+                for ctx in batch:
+                    if self._should_index_file(ctx.path, ctx.stat, indexed_mtimes):
+                        yield ctx
         
-        self.stats["total_files"] = len(files_to_index)
-        logger.info(f"Found {len(files_to_index)} files to process")
+        # Cheap size/incremental checks stay in this process; extraction
+        # runs in worker processes while finished documents are uploaded
+        completed = _prepare_documents(ContentExtractor._get_process_pool(), files_to_index())
         
-        # Index files with progress bar
+        # Index files with progress bar (the total is unknown until the walk ends)
         if show_progress:
-            iterator = tqdm(files_to_index, desc="Indexing files", unit="file")
-        else:
-            iterator = files_to_index
+            completed = tqdm(completed, desc="Indexing files", unit="file")
         
-        for file_path in iterator:
-            self.index_file(file_path)
+        # Time candidate batch sizes on the first documents extracted; the
+        # sample is uploaded again below, which just overwrites it. Files
+        # that failed extraction have no document and are left out
+        batch_size = None
+        if Config.AUTOTUNE_BATCH:
+            completed = iter(completed)
+            warm_up = list(islice(completed, sum(_BATCH_SIZE_CANDIDATES)))
+            sample = [future.result()[1] for future in warm_up]
+            batch_size = self._tune_batch_size([document for document in sample if document is not None])
+            completed = chain(warm_up, completed)
+        
+        # Documents are handed to an upload thread, so a batch flush does not
+        # stop this thread from collecting results and submitting new files
+        upload_queue = queue.Queue(maxsize=_UPLOAD_QUEUE_SIZE)
+        
+        def upload_documents():
+            for ctx, document in iter(upload_queue.get, None):
+                logger.opt(lazy=True).debug("Indexing: {}", lambda: ctx.name)
+                self._upload_document(ctx.path, document, ctx.stat)
+        
+        # Closing the sender flushes the documents still queued
+        with self._open_sender(batch_size) as self._sender:
+            uploader = threading.Thread(target=upload_documents, name="indexer-upload", daemon=True)
+            uploader.start()
+            try:
+                for future in completed:
+                    ctx, document, extraction_stats = future.result()
+                    self.extractor._merge_statistics(extraction_stats)
+                    upload_queue.put((ctx, document))
+            finally:
+                upload_queue.put(None)
+                uploader.join()
+                self._sender = None
         
         self.stats["end_time"] = datetime.now()
         
         # Save cache
-        if Config.INCREMENTAL_INDEXING:
-            self._save_indexed_files_cache()
+        with self._lock:
+            self._commit_indexed_files_cache()
         
         # Print summary
         self._print_summary()
@@ -329,4 +567,111 @@ class FileIndexer:
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get indexing statistics"""
-        return self.stats.copy()
\ No newline at end of file
+        return self.stats.copy()
+
+
+def _build_document(extractor: ContentExtractor, file_path: Union[str, FileContext]) -> Optional[Dict[str, Any]]:
+    """
+    Extract a file and build its search document
+    
+    Args:
+        extractor: Content extractor to use
+        file_path: Path to the file, or its FileContext
+        
+    Returns:
+        Document dictionary or None if preparation fails
+    """
+    try:
+        # Stat the file once for both extraction calls
+        if isinstance(file_path, FileContext):
+            ctx = file_path
+        else:
+            ctx = FileContext.from_path(file_path)
+        file_path = ctx.path
+        
+        # Extract content first, reading no more than is stored; metadata
+        # then comes from that partial parse instead of a full one
+        content = extractor.extract_text(ctx, max_chars=_MAX_CONTENT_LENGTH)
+        if len(content) == _MAX_CONTENT_LENGTH:
+            logger.warning(f"Truncated content for {file_path} to {_MAX_CONTENT_LENGTH} chars")
+        
+        # Extract metadata
+        metadata = extractor.extract_metadata(ctx)
+        
+        # The extension is already resolved, so strip it rather than re-split
+        file_name = metadata["file_name"]
+        stem = file_name[:len(file_name) - len(ctx.ext)] if ctx.ext else file_name
+        
+        # Prepare document
+        document = {
+            "id": FileIndexer._generate_document_id(file_path),
+            "content": content,
+            "title": metadata.get("document_title") or stem,
+            "name": file_name,
+            "filePath": file_path,
+            "extension": metadata["file_extension"],
+            "size": metadata["file_size_bytes"],
+            "createdDateTime": metadata["created_time"],
+            "modifiedDateTime": metadata["modified_time"],
+            "createdBy": metadata.get("owner", "Unknown"),
+            "lastModifiedBy": metadata.get("owner", "Unknown"),
+            "fileType": "File",
+            "url": file_path,
+        }
+        
+        # Add document-specific metadata if available
+        if "document_author" in metadata:
+            document["author"] = metadata["document_author"]
+        if "document_keywords" in metadata:
+            document["keywords"] = metadata["document_keywords"]
+        
+        return document
+        
+    except ExtractionError as e:
+        logger.error(f"Failed to prepare document {file_path}: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Unexpected error preparing {file_path}: {e}")
+        return None
+
+
+def _prepare_document_worker(ctx: FileContext) -> Tuple[FileContext, Optional[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Prepare one document in a worker process
+    
+    Args:
+        ctx: File context for the file
+        
+    Returns:
+        Tuple of (ctx, document or None on failure, extraction statistics)
+    """
+    extractor = ContentExtractor()
+    document = _build_document(extractor, ctx)
+    return ctx, document, extractor.stats
+
+
+def _prepare_documents(pool: Executor, files: Iterable[FileContext]) -> Iterator[Future]:
+    """
+    Prepare documents in the pool, yielding futures as they finish
+    
+    Submits files as they are produced but keeps only a few jobs per
+    worker queued, so a huge walk never holds more than a bounded
+    number of pending documents in memory.
+    
+    Args:
+        pool: Executor to run _prepare_document_worker in
+        files: Files to prepare
+        
+    Yields:
+        Finished futures, in completion order
+    """
+    max_pending = (os.cpu_count() or 1) * _PENDING_PER_WORKER
+    pending = set()
+    
+    for ctx in files:
+        pending.add(pool.submit(_prepare_document_worker, ctx))
+        if len(pending) >= max_pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from done
+    
+    yield from as_completed(pending)
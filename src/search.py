@@ -5,17 +5,103 @@ Supports keyword, vector, hybrid, and semantic search
 Author: Edgar McOchieng
 """
 
-from typing import List, Dict, Optional, Any
+import asyncio
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Dict, Optional, Any
 from azure.search.documents import SearchClient as AzureSearchClient
 from azure.search.documents.models import VectorizedQuery, QueryType
 from azure.core.credentials import AzureKeyCredential
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI, AzureOpenAI
 
-from config import Config
+from config import Config, get_http_transport
 from config.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Identical searches repeated within this many seconds reuse the results
+_RESULT_CACHE_TTL = 60
+
+# Searches kept in each client's result cache
+_RESULT_CACHE_SIZE = 256
+
+# Query embeddings kept in each client's embedding cache
+_EMBEDDING_CACHE_SIZE = 1024
+
+# Default fields to return, pre-joined: the SDK sends a select string as
+# is (a tuple would be ignored), so nothing is rebuilt per search
+_KEYWORD_SELECT = "title,chunk,name,filePath,extension,modifiedDateTime"
+_VECTOR_SELECT = "title,chunk,name,filePath,chunkNumber,modifiedDateTime"
+_HYBRID_SELECT = "title,chunk,name,filePath,extension,chunkNumber,modifiedDateTime"
+
+
+@functools.lru_cache(maxsize=256)
+def _build_filter(
+    extension: Optional[str],
+    date_from: Optional[str],
+    date_to: Optional[str],
+    author: Optional[str]
+) -> Optional[str]:
+    """Build an OData filter expression from metadata filters (None if no filters)"""
+    filters = []
+    
+    if extension:
+        filters.append(f"extension eq '{extension}'")
+    
+    if date_from:
+        filters.append(f"modifiedDateTime ge {date_from}")
+    
+    if date_to:
+        filters.append(f"modifiedDateTime le {date_to}")
+    
+    if author:
+        filters.append(f"search.in(createdBy, '{author}', ',')")
+    
+    return " and ".join(filters) if filters else None
+
+
+def _cache_key_part(value: Any) -> Any:
+    """Make a search argument hashable (lists such as select and query_vector become tuples)"""
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _cache_results(method):
+    """Serve a search method's repeated identical calls from the result cache
+    
+    Every argument, including a precomputed query_vector, is part of the key.
+    Callers get their own copies of the result dicts, so changing them does
+    not change what later calls are served.
+    """
+    @functools.wraps(method)
+    def wrapper(self, query, top=None, filter_expr=None, select=None, *args, **kwargs):
+        key = (
+            method.__name__, query, top, filter_expr, _cache_key_part(select),
+            tuple(map(_cache_key_part, args)),
+            tuple(sorted((name, _cache_key_part(value)) for name, value in kwargs.items()))
+        )
+        now = time.monotonic()
+        
+        with self._cache_lock:
+            cached = self._result_cache.get(key)
+            if cached is not None and now - cached[0] < _RESULT_CACHE_TTL:
+                self._result_cache.move_to_end(key)
+                logger.debug(f"Using cached results for '{query}'")
+                return [dict(result) for result in cached[1]]
+        
+        results = method(self, query, top, filter_expr, select, *args, **kwargs)
+        
+        with self._cache_lock:
+            self._result_cache[key] = (now, results)
+            self._result_cache.move_to_end(key)
+            if len(self._result_cache) > _RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+        
+        return [dict(result) for result in results]
+    
+    return wrapper
+
 
 class SearchClient:
     """
@@ -48,9 +134,17 @@ class SearchClient:
         self.search_client = AzureSearchClient(
             endpoint=Config.AZURE_SEARCH_ENDPOINT,
             index_name=self.index_name,
-            credential=AzureKeyCredential(Config.AZURE_SEARCH_KEY)
+            credential=AzureKeyCredential(Config.AZURE_SEARCH_KEY),
+            transport=get_http_transport()
         )
         
+        # Recent results keyed by search method and arguments, and query
+        # embeddings keyed by query text; searches may run on several
+        # threads at once (search_many)
+        self._result_cache = OrderedDict()
+        self._embedding_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
         # Initialize OpenAI for vector queries
         self.vector_enabled = False
         if use_vector_index:
@@ -82,13 +176,79 @@ class SearchClient:
         if not self.vector_enabled:
             raise ValueError("Vector search not configured. Check OpenAI settings.")
         
+        embedding = self._cached_embedding(query)
+        if embedding is not None:
+            return embedding
+        
         response = self.openai_client.embeddings.create(
             input=query,
             model=Config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT
         )
         
-        return response.data[0].embedding
+        embedding = response.data[0].embedding
+        self._cache_embedding(query, embedding)
+        return embedding
     
+    async def generate_query_embeddings_async(self, queries: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for many search queries concurrently
+        
+        The requests are sent together with asyncio.gather, so the
+        embedding stage takes about one round trip instead of one per query.
+        
+        Args:
+            queries: Search query texts
+            
+        Returns:
+            Embedding vectors in query order
+            
+        Raises:
+            ValueError: If vector search not configured
+        """
+        if not self.vector_enabled:
+            raise ValueError("Vector search not configured. Check OpenAI settings.")
+        
+        embeddings = {query: self._cached_embedding(query) for query in queries}
+        missing = [query for query, embedding in embeddings.items() if embedding is None]
+        if not missing:
+            return [embeddings[query] for query in queries]
+        
+        # The async client's connections belong to the running event loop,
+        # so it is opened per call rather than kept on the instance
+        async with AsyncAzureOpenAI(
+            azure_endpoint=Config.AZURE_OPENAI_ENDPOINT,
+            api_key=Config.AZURE_OPENAI_KEY,
+            api_version=Config.AZURE_OPENAI_API_VERSION
+        ) as client:
+            responses = await asyncio.gather(*(
+                client.embeddings.create(input=query, model=Config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT)
+                for query in missing
+            ))
+        
+        for query, response in zip(missing, responses):
+            embeddings[query] = response.data[0].embedding
+            self._cache_embedding(query, embeddings[query])
+        
+        return [embeddings[query] for query in queries]
+    
+    def _cached_embedding(self, query: str) -> Optional[List[float]]:
+        """Get a copy of the cached embedding for a query (None if not cached)"""
+        with self._cache_lock:
+            embedding = self._embedding_cache.get(query)
+            if embedding is None:
+                return None
+            self._embedding_cache.move_to_end(query)
+            return list(embedding)
+    
+    def _cache_embedding(self, query: str, embedding: List[float]):
+        """Add a query embedding to the cache, evicting the least recently used"""
+        with self._cache_lock:
+            self._embedding_cache[query] = tuple(embedding)
+            self._embedding_cache.move_to_end(query)
+            if len(self._embedding_cache) > _EMBEDDING_CACHE_SIZE:
+                self._embedding_cache.popitem(last=False)
+    
+    @_cache_results
     def search(
         self,
         query: str,
@@ -109,7 +269,7 @@ class SearchClient:
             List of search results
         """
         top = top or Config.DEFAULT_TOP_K
-        select = select or ["title", "chunk", "name", "filePath", "extension", "modifiedDateTime"]
+        select = select or _KEYWORD_SELECT
         
         logger.info(f"Keyword search: '{query}' (top={top})")
         
@@ -126,12 +286,14 @@ class SearchClient:
         
         return results_list
     
+    @_cache_results
     def vector_search(
         self,
         query: str,
         top: Optional[int] = None,
         filter_expr: Optional[str] = None,
-        select: Optional[List[str]] = None
+        select: Optional[List[str]] = None,
+        query_vector: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Pure vector similarity search
@@ -141,6 +303,7 @@ class SearchClient:
             top: Number of results
             filter_expr: OData filter expression
             select: Fields to return
+            query_vector: Precomputed query embedding (generated if None)
             
         Returns:
             List of search results
@@ -149,12 +312,13 @@ class SearchClient:
             raise ValueError("Vector search not available. Use keyword search instead.")
         
         top = top or Config.DEFAULT_TOP_K
-        select = select or ["title", "chunk", "name", "filePath", "chunkNumber", "modifiedDateTime"]
+        select = select or _VECTOR_SELECT
         
         logger.info(f"Vector search: '{query}' (top={top})")
         
         # Generate query embedding
-        query_vector = self.generate_query_embedding(query)
+        if query_vector is None:
+            query_vector = self.generate_query_embedding(query)
         
         # Create vector query
         vector_query = VectorizedQuery(
@@ -177,12 +341,14 @@ class SearchClient:
         
         return results_list
     
+    @_cache_results
     def hybrid_search(
         self,
         query: str,
         top: Optional[int] = None,
         filter_expr: Optional[str] = None,
-        select: Optional[List[str]] = None
+        select: Optional[List[str]] = None,
+        query_vector: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Hybrid search combining keyword and vector search
@@ -192,6 +358,7 @@ class SearchClient:
             top: Number of results
             filter_expr: OData filter expression
             select: Fields to return
+            query_vector: Precomputed query embedding (generated if None)
             
         Returns:
             List of search results
@@ -201,12 +368,13 @@ class SearchClient:
             return self.search(query, top, filter_expr, select)
         
         top = top or Config.DEFAULT_TOP_K
-        select = select or ["title", "chunk", "name", "filePath", "extension", "chunkNumber", "modifiedDateTime"]
+        select = select or _HYBRID_SELECT
         
         logger.info(f"Hybrid search: '{query}' (top={top})")
         
         # Generate query embedding
-        query_vector = self.generate_query_embedding(query)
+        if query_vector is None:
+            query_vector = self.generate_query_embedding(query)
         
         # Create vector query
         vector_query = VectorizedQuery(
@@ -230,12 +398,14 @@ class SearchClient:
         
         return results_list
     
+    @_cache_results
     def semantic_search(
         self,
         query: str,
         top: Optional[int] = None,
         filter_expr: Optional[str] = None,
-        select: Optional[List[str]] = None
+        select: Optional[List[str]] = None,
+        query_vector: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Semantic search with intelligent reranking
@@ -247,6 +417,7 @@ class SearchClient:
             top: Number of results
             filter_expr: OData filter expression
             select: Fields to return
+            query_vector: Precomputed query embedding (generated if None)
             
         Returns:
             List of search results with semantic scores
@@ -257,15 +428,16 @@ class SearchClient:
         
         if not Config.ENABLE_SEMANTIC_RERANKING:
             logger.warning("Semantic reranking disabled. Using hybrid search instead.")
-            return self.hybrid_search(query, top, filter_expr, select)
+            return self.hybrid_search(query, top, filter_expr, select, query_vector)
         
         top = top or Config.DEFAULT_TOP_K
-        select = select or ["title", "chunk", "name", "filePath", "extension", "chunkNumber", "modifiedDateTime"]
+        select = select or _HYBRID_SELECT
         
         logger.info(f"Semantic search: '{query}' (top={top})")
         
         # Generate query embedding
-        query_vector = self.generate_query_embedding(query)
+        if query_vector is None:
+            query_vector = self.generate_query_embedding(query)
         
         # Create vector query
         vector_query = VectorizedQuery(
@@ -318,34 +490,92 @@ class SearchClient:
             List of filtered search results
         """
         # Build filter expression
-        filters = []
-        
-        if extension:
-            filters.append(f"extension eq '{extension}'")
-        
-        if date_from:
-            filters.append(f"modifiedDateTime ge {date_from}")
-        
-        if date_to:
-            filters.append(f"modifiedDateTime le {date_to}")
-        
-        if author:
-            filters.append(f"search.in(createdBy, '{author}', ',')")
-        
-        filter_expr = " and ".join(filters) if filters else None
+        filter_expr = _build_filter(extension, date_from, date_to, author)
         
         logger.info(f"Filtered search: query='{query}', filters='{filter_expr}'")
         
         # Execute appropriate search type
+        search_method = self._search_method(search_type)
+        return search_method(query, top, filter_expr)
+    
+    def _search_method(self, search_type: str) -> Callable[..., List[Dict[str, Any]]]:
+        """Get the search method for a search type (hybrid if unknown)"""
         search_methods = {
             "keyword": self.search,
             "vector": self.vector_search,
             "hybrid": self.hybrid_search,
             "semantic": self.semantic_search
         }
+        return search_methods.get(search_type, self.hybrid_search)
+    
+    async def search_many_async(
+        self,
+        queries: List[str],
+        top: Optional[int] = None,
+        filter_expr: Optional[str] = None,
+        select: Optional[List[str]] = None,
+        search_type: str = "hybrid"
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run many searches concurrently
         
-        search_method = search_methods.get(search_type, self.hybrid_search)
-        return search_method(query, top, filter_expr)
+        Query embeddings are generated together, then the searches run
+        concurrently on worker threads.
+        
+        Args:
+            queries: Search queries
+            top: Number of results per query
+            filter_expr: OData filter expression
+            select: Fields to return
+            search_type: Type of search ("keyword", "vector", "hybrid", "semantic")
+            
+        Returns:
+            List of search results for each query, in query order
+        """
+        search_method = self._search_method(search_type)
+        logger.info(f"Running {len(queries)} {search_type} searches")
+        
+        if search_method == self.search or not self.vector_enabled:
+            calls = [functools.partial(search_method, query, top, filter_expr, select) for query in queries]
+        else:
+            query_vectors = await self.generate_query_embeddings_async(queries)
+            calls = [
+                functools.partial(search_method, query, top, filter_expr, select, query_vector)
+                for query, query_vector in zip(queries, query_vectors)
+            ]
+        
+        return list(await asyncio.gather(*map(asyncio.to_thread, calls)))
+    
+    def search_many(
+        self,
+        queries: List[str],
+        top: Optional[int] = None,
+        filter_expr: Optional[str] = None,
+        select: Optional[List[str]] = None,
+        search_type: str = "hybrid"
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run many searches concurrently (blocking wrapper for search_many_async)
+        
+        Must not be called from a running event loop; await
+        search_many_async() there instead.
+        
+        Args:
+            queries: Search queries
+            top: Number of results per query
+            filter_expr: OData filter expression
+            select: Fields to return
+            search_type: Type of search ("keyword", "vector", "hybrid", "semantic")
+            
+        Returns:
+            List of search results for each query, in query order
+        """
+        return asyncio.run(self.search_many_async(queries, top, filter_expr, select, search_type))
+    
+    def invalidate_cache(self):
+        """Drop cached search results, e.g. after the index is updated"""
+        with self._cache_lock:
+            self._result_cache.clear()
     
     def format_results(self, results: List[Dict[str, Any]], show_scores: bool = True) -> str:
         """
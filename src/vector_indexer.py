@@ -5,24 +5,106 @@ Provides semantic search capabilities through Azure OpenAI embeddings
 Author: Edgar McOchieng
 """
 
+import asyncio
+import gzip
+import json
 import os
 import hashlib
+import queue
+import sqlite3
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from pathlib import Path
 from azure.search.documents import SearchClient
 from azure.core.credentials import AzureKeyCredential
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI, AzureOpenAI
 import tiktoken
 from tqdm import tqdm
 import time
 
-from config import Config
+from config import Config, get_http_transport, retry_wait
 from config.logger import get_logger
-from .extractors import ContentExtractor, ExtractionError
+from .extractors import ContentExtractor, ExtractionError, FileContext
+
+try:
+    import zstandard
+except ImportError:  # optional: the file cache falls back to gzip
+    zstandard = None
 
 logger = get_logger(__name__)
 
+# Compression levels for the file cache; both favor speed, since the
+# paths repeat heavily and compress well even at low levels
+_ZSTD_LEVEL = 3
+_GZIP_LEVEL = 1
+
+# Inputs sent per embeddings request; Azure OpenAI accepts up to 2048, and
+# fewer keeps each request well under its token limit
+_EMBEDDING_BATCH_SIZE = 64
+
+# Embedding requests in flight at once when a text needs several batches
+_MAX_CONCURRENT_EMBEDDING_REQUESTS = 8
+
+# Embedding cache writes are committed every this many embeddings
+_EMBEDDING_COMMIT_INTERVAL = 1000
+
+# Requests per Batch API job (the service accepts up to 100,000 per file)
+_BATCH_JOB_MAX_REQUESTS = 50000
+
+# Batch API job statuses after which the job makes no more progress
+_BATCH_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+# Files held between index_directory pipeline stages; bounds how far
+# extraction can run ahead of embedding and uploading
+_PIPELINE_QUEUE_SIZE = 8
+
+# Chunks from which chunk_text decodes them in parallel
+_DECODE_BATCH_MIN_CHUNKS = 8
+
+# Longest input sent to the embedding model, in tokens (the limit is 8191)
+_MAX_EMBEDDING_TOKENS = 8000
+
+
+def _open_cache_file(path: Path, mode: str):
+    """Open a cache file as text, compressed according to its suffix (.zst, .gz or none)"""
+    if path.suffix == ".zst":
+        return zstandard.open(path, mode, cctx=zstandard.ZstdCompressor(level=_ZSTD_LEVEL), encoding='utf-8')
+    if path.suffix == ".gz":
+        return gzip.open(path, mode, compresslevel=_GZIP_LEVEL, encoding='utf-8')
+    return open(path, mode[0], encoding='utf-8')
+
+
+def _pack_embedding(embedding: List[float]) -> bytes:
+    """Pack an embedding as float16 values for the cache
+    
+    Embedding components are small (well under 1 in magnitude), so half
+    precision keeps about three significant digits at a quarter of the
+    float64 size.
+    """
+    return struct.pack(f"<{len(embedding)}e", *embedding)
+
+
+def _unpack_embedding(data: bytes) -> List[float]:
+    """Unpack an embedding stored by _pack_embedding()"""
+    return list(struct.unpack(f"<{len(data) // 2}e", data))
+
+
+def _in_event_loop() -> bool:
+    """Whether the calling thread is already running an asyncio event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _embedding_key(text: str) -> str:
+    """Embedding cache key for a text"""
+    return hashlib.md5(text.encode()).hexdigest()
+
 
 class VectorIndexer:
     """
@@ -54,7 +136,8 @@ class VectorIndexer:
         self.search_client = SearchClient(
             endpoint=Config.AZURE_SEARCH_ENDPOINT,
             index_name=self.index_name,
-            credential=AzureKeyCredential(Config.AZURE_SEARCH_KEY)
+            credential=AzureKeyCredential(Config.AZURE_SEARCH_KEY),
+            transport=get_http_transport()
         )
         
         # Initialize OpenAI client
@@ -85,83 +168,186 @@ class VectorIndexer:
         }
         
         # Embedding cache
-        self.embedding_cache = {}
+        self._embedding_db = None
+        self._pending_embedding_writes = 0
         if Config.CACHE_EMBEDDINGS:
-            self._load_embedding_cache()
+            self._open_embedding_cache()
         
         # Incremental indexing cache
         self.indexed_files_cache = {}
+        self._files_log = None
+        self._files_log_entries = 0
         if Config.INCREMENTAL_INDEXING:
             self._load_indexed_files_cache()
     
-    def _load_embedding_cache(self):
-        """Load cached embeddings"""
-        cache_file = Path(Config.CACHE_DIR) / f"{self.index_name}_embeddings.cache"
-        if cache_file.exists():
-            try:
+    def _open_embedding_cache(self):
+        """Open the SQLite embedding cache
+        
+        Each embedding is a row of packed float16 values keyed by the MD5
+        of its text, so startup does not load the cache and a hit reads one
+        row. A pickled cache left by earlier versions is imported on first
+        open.
+        """
+        cache_dir = Path(Config.CACHE_DIR)
+        
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            # index_directory() embeds on a worker thread; the cache is only
+            # used from one thread at a time
+            self._embedding_db = sqlite3.connect(
+                cache_dir / f"{self.index_name}_embeddings.db", check_same_thread=False
+            )
+            self._embedding_db.execute("PRAGMA journal_mode=WAL")
+            self._embedding_db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)")
+            
+            legacy_file = cache_dir / f"{self.index_name}_embeddings.cache"
+            if legacy_file.exists() and not self._embedding_db.execute("SELECT 1 FROM embeddings LIMIT 1").fetchone():
                 import pickle
-                with open(cache_file, 'rb') as f:
-                    self.embedding_cache = pickle.load(f)
-                logger.info(f"Loaded {len(self.embedding_cache)} cached embeddings")
-            except Exception as e:
-                logger.warning(f"Could not load embedding cache: {e}")
+                with open(legacy_file, 'rb') as f:
+                    legacy_cache = pickle.load(f)
+                self._embedding_db.executemany(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?)",
+                    ((key, _pack_embedding(embedding)) for key, embedding in legacy_cache.items())
+                )
+                self._embedding_db.commit()
+                logger.info(f"Imported {len(legacy_cache)} cached embeddings from {legacy_file}")
+        except Exception as e:
+            logger.warning(f"Could not open embedding cache: {e}")
+            self._embedding_db = None
     
     def _save_embedding_cache(self):
-        """Save embedding cache"""
-        if not Config.CACHE_EMBEDDINGS:
+        """Commit pending embedding cache writes"""
+        if self._embedding_db is None or not self._pending_embedding_writes:
             return
         
-        cache_file = Path(Config.CACHE_DIR) / f"{self.index_name}_embeddings.cache"
-        cache_file.parent.mkdir(parents=True, exist_ok=True)
-        
         try:
-            import pickle
-            with open(cache_file, 'wb') as f:
-                pickle.dump(self.embedding_cache, f)
-            logger.info(f"Saved {len(self.embedding_cache)} embeddings to cache")
-        except Exception as e:
+            self._embedding_db.commit()
+            logger.debug(f"Saved {self._pending_embedding_writes} embeddings to cache")
+            self._pending_embedding_writes = 0
+        except sqlite3.Error as e:
             logger.warning(f"Could not save embedding cache: {e}")
     
+    def _indexed_files_cache_path(self) -> Path:
+        """Path of the compressed cache of indexed files"""
+        suffix = ".zst" if zstandard is not None else ".gz"
+        return Path(Config.CACHE_DIR) / f"{self.index_name}_files.cache{suffix}"
+    
+    def _indexed_files_log_path(self) -> Path:
+        """Path of the append log of files indexed since the cache was last compacted"""
+        return Path(Config.CACHE_DIR) / f"{self.index_name}_files.log"
+    
     def _load_indexed_files_cache(self):
-        """Load cache of previously indexed files"""
-        cache_file = Path(Config.CACHE_DIR) / f"{self.index_name}_files.cache"
-        if cache_file.exists():
+        """Load cache of previously indexed files
+        
+        Falls back to a gzip cache (written while zstandard was not
+        installed) or an uncompressed one left by earlier versions. Entries
+        in the append log are applied on top, later lines winning.
+        """
+        cache_file = self._indexed_files_cache_path()
+        candidates = (cache_file, cache_file.with_suffix(".gz"), cache_file.with_suffix(""))
+        cache_file = next((candidate for candidate in candidates if candidate.exists()), None)
+        
+        if cache_file is not None:
             try:
-                with open(cache_file, 'r') as f:
+                with _open_cache_file(cache_file, 'rt') as f:
                     for line in f:
                         path, mtime = line.strip().split('|')
                         self.indexed_files_cache[path] = float(mtime)
-                logger.info(f"Loaded {len(self.indexed_files_cache)} cached file entries")
             except Exception as e:
                 logger.warning(f"Could not load file cache: {e}")
+        
+        log_file = self._indexed_files_log_path()
+        if log_file.exists():
+            try:
+                with open(log_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        path, _, mtime = line.rstrip('\n').rpartition('|')
+                        try:
+                            self.indexed_files_cache[path] = float(mtime)
+                        except ValueError:
+                            continue  # torn last line from an interrupted run
+                        self._files_log_entries += 1
+            except Exception as e:
+                logger.warning(f"Could not load file cache log: {e}")
+        
+        if self.indexed_files_cache:
+            logger.info(f"Loaded {len(self.indexed_files_cache)} cached file entries")
+    
+    def _record_indexed_file(self, file_path: str, mtime: float):
+        """Add a file to the cache and append it to the log, so it persists even if the run stops early"""
+        self.indexed_files_cache[file_path] = mtime
+        
+        try:
+            if self._files_log is None:
+                log_file = self._indexed_files_log_path()
+                log_file.parent.mkdir(parents=True, exist_ok=True)
+                
+                # A run stopped part way through a write leaves a torn last
+                # line; end it so this run's first entry starts a line
+                with open(log_file, 'ab+') as f:
+                    size = f.seek(0, os.SEEK_END)
+                    if size:
+                        f.seek(size - 1)
+                        if f.read(1) != b'\n':
+                            f.write(b'\n')
+                
+                self._files_log = open(log_file, 'a', encoding='utf-8', buffering=1)
+            self._files_log.write(f"{file_path}|{mtime}\n")
+            self._files_log_entries += 1
+        except Exception as e:
+            logger.warning(f"Could not append to file cache log: {e}")
     
     def _save_indexed_files_cache(self):
-        """Save cache of indexed files"""
-        cache_file = Path(Config.CACHE_DIR) / f"{self.index_name}_files.cache"
+        """Save cache of indexed files
+        
+        Entries are already in the append log; it is compacted into the
+        cache file once it holds at least half as many lines as the cache
+        has entries, so each run writes in proportion to what changed.
+        """
+        if self._files_log is not None:
+            self._files_log.close()
+            self._files_log = None
+        
+        if self._files_log_entries * 2 < len(self.indexed_files_cache):
+            return
+        
+        cache_file = self._indexed_files_cache_path()
         cache_file.parent.mkdir(parents=True, exist_ok=True)
         
         try:
-            with open(cache_file, 'w') as f:
+            with _open_cache_file(cache_file, 'wt') as f:
                 for path, mtime in self.indexed_files_cache.items():
                     f.write(f"{path}|{mtime}\n")
+            self._indexed_files_log_path().unlink(missing_ok=True)
+            self._files_log_entries = 0
             logger.info("Saved file indexing cache")
         except Exception as e:
             logger.warning(f"Could not save file cache: {e}")
     
-    def _should_index_file(self, file_path: str) -> bool:
-        """Check if file should be indexed"""
+    def _should_index_file(self, file_path: str, st: Optional[os.stat_result] = None) -> bool:
+        """Check if file should be indexed
+        
+        Args:
+            file_path: Path to the file to check
+            st: Stat result for the file if already known
+            
+        Returns:
+            True if file should be indexed, False otherwise
+        """
+        if st is None:
+            st = os.stat(file_path)
+        
         # Check file size
-        file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
+        file_size_mb = st.st_size / (1024 * 1024)
         if file_size_mb > Config.MAX_FILE_SIZE_MB:
             logger.warning(f"Skipping {file_path}: exceeds max size ({file_size_mb:.2f} MB)")
             return False
         
         # Check if file was already indexed (incremental)
         if Config.INCREMENTAL_INDEXING:
-            mtime = os.path.getmtime(file_path)
             cached_mtime = self.indexed_files_cache.get(file_path)
             
-            if cached_mtime and mtime <= cached_mtime:
+            if cached_mtime and st.st_mtime <= cached_mtime:
                 logger.debug(f"Skipping {file_path}: already indexed")
                 self.stats["skipped"] += 1
                 return False
@@ -189,17 +375,15 @@ class VectorIndexer:
         if len(tokens) <= chunk_size:
             return [text]
         
-        chunks = []
-        start = 0
-        
-        while start < len(tokens):
-            end = start + chunk_size
-            chunk_tokens = tokens[start:end]
-            chunk_text = self.encoding.decode(chunk_tokens)
-            chunks.append(chunk_text)
-            
-            # Move start position with overlap
-            start += chunk_size - overlap
+        # Windows start every chunk_size - overlap tokens. decode_batch
+        # decodes on a thread pool outside the GIL, which only pays for its
+        # startup on long documents
+        stride = chunk_size - overlap
+        windows = [tokens[start:start + chunk_size] for start in range(0, len(tokens), stride)]
+        if len(windows) >= _DECODE_BATCH_MIN_CHUNKS:
+            chunks = self.encoding.decode_batch(windows)
+        else:
+            chunks = [self.encoding.decode(window) for window in windows]
         
         logger.debug(f"Split text into {len(chunks)} chunks ({len(tokens)} tokens total)")
         return chunks
@@ -215,62 +399,235 @@ class VectorIndexer:
         Returns:
             Embedding vector or None if generation fails
         """
-        # Check cache
-        if use_cache and Config.CACHE_EMBEDDINGS:
-            cache_key = hashlib.md5(text.encode()).hexdigest()
-            if cache_key in self.embedding_cache:
-                logger.debug("Using cached embedding")
-                return self.embedding_cache[cache_key]
+        return self.generate_embeddings_batch([text], use_cache)[0]
+    
+    def generate_embeddings_batch(self, texts: List[str], use_cache: bool = True) -> List[Optional[List[float]]]:
+        """
+        Generate embeddings for many texts with as few API calls as possible
+        
+        Cached texts are served from the cache; the rest are sent
+        _EMBEDDING_BATCH_SIZE inputs per request, with several requests
+        in flight at once when there is more than one batch. Called from
+        a thread that is running an event loop (Jupyter, an async host),
+        the batches are requested one after another instead.
+        
+        Args:
+            texts: Texts to embed
+            use_cache: Whether to use cached embeddings
+            
+        Returns:
+            Embedding vectors in input order (None where generation failed)
+        """
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        
+        # Check cache; repeated texts are only requested once, and each
+        # text's key is hashed once for both the lookup and the write
+        missing: Dict[str, List[int]] = {}
+        keys: Dict[str, str] = {}
+        for i, text in enumerate(texts):
+            if text in missing:
+                missing[text].append(i)
+                continue
+            
+            key = keys[text] = _embedding_key(text)
+            embedding = self._cached_embedding(key) if use_cache else None
+            if embedding is not None:
+                embeddings[i] = embedding
+            else:
+                missing[text] = [i]
+        
+        if len(missing) < len(texts):
+            logger.debug(f"Requesting {len(missing)} of {len(texts)} embeddings")
+        
+        # Longest texts first: each batch then holds inputs of similar
+        # length, and the slowest batches start first rather than
+        # straggling behind the concurrent ones
+        missing_texts = sorted(missing, key=len, reverse=True)
+        batches = [
+            missing_texts[start:start + _EMBEDDING_BATCH_SIZE]
+            for start in range(0, len(missing_texts), _EMBEDDING_BATCH_SIZE)
+        ]
+        inputs = [[self._truncate_for_embedding(text) for text in batch] for batch in batches]
+        
+        # Several batches are requested concurrently, except where
+        # asyncio.run() cannot start a loop of its own
+        if len(batches) > 1 and not _in_event_loop():
+            results = asyncio.run(self._request_embedding_batches(inputs))
+        else:
+            results = [self._request_embeddings(batch) for batch in inputs]
+        
+        for batch, vectors in zip(batches, results):
+            if vectors is None:
+                continue
+            
+            for text, embedding in zip(batch, vectors):
+                for i in missing[text]:
+                    embeddings[i] = embedding
+                
+                # Cache the embedding
+                self._cache_embedding(keys[text], embedding)
+        
+        return embeddings
+    
+    def _cached_embedding(self, key: str) -> Optional[List[float]]:
+        """Get the cached embedding for a cache key (None if not cached)"""
+        if self._embedding_db is None:
+            return None
+        
+        row = self._embedding_db.execute(
+            "SELECT vector FROM embeddings WHERE key = ?", (key,)
+        ).fetchone()
+        return _unpack_embedding(row[0]) if row else None
+    
+    def _cache_embedding(self, key: str, embedding: List[float]):
+        """Cache an embedding under its _embedding_key(), committing every _EMBEDDING_COMMIT_INTERVAL writes"""
+        if self._embedding_db is None:
+            return
+        
+        self._embedding_db.execute(
+            "INSERT OR REPLACE INTO embeddings VALUES (?, ?)",
+            (key, _pack_embedding(embedding))
+        )
+        self._pending_embedding_writes += 1
+        if self._pending_embedding_writes >= _EMBEDDING_COMMIT_INTERVAL:
+            self._save_embedding_cache()
+    
+    def _truncate_for_embedding(self, text: str) -> str:
+        """Truncate text to the embedding model's input limit"""
+        # Every token covers at least one UTF-8 byte, so a text no longer
+        # than the limit in bytes fits without tokenizing it
+        if len(text.encode()) <= _MAX_EMBEDDING_TOKENS:
+            return text
         
-        # Truncate if too long (max 8191 tokens for text-embedding models)
         tokens = self.encoding.encode(text)
-        if len(tokens) > 8000:
-            logger.debug(f"Truncating text from {len(tokens)} to 8000 tokens")
-            tokens = tokens[:8000]
-            text = self.encoding.decode(tokens)
+        if len(tokens) > _MAX_EMBEDDING_TOKENS:
+            logger.debug(f"Truncating text from {len(tokens)} to {_MAX_EMBEDDING_TOKENS} tokens")
+            text = self.encoding.decode(tokens[:_MAX_EMBEDDING_TOKENS])
+        return text
+    
+    def _request_embeddings(self, inputs: List[str]) -> Optional[List[List[float]]]:
+        """
+        Embed a batch of inputs in one API call, with retry logic
         
-        # Generate embedding with retry logic
+        Args:
+            inputs: Texts to embed (already truncated)
+            
+        Returns:
+            Embedding vectors in input order, or None if every attempt fails
+        """
         for attempt in range(Config.MAX_RETRIES):
             try:
                 response = self.openai_client.embeddings.create(
-                    input=text,
+                    input=inputs,
                     model=Config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT
                 )
-                
-                embedding = response.data[0].embedding
                 self.stats["embedding_api_calls"] += 1
                 
-                # Cache the embedding
-                if Config.CACHE_EMBEDDINGS:
-                    cache_key = hashlib.md5(text.encode()).hexdigest()
-                    self.embedding_cache[cache_key] = embedding
-                
-                return embedding
+                # Each result carries the index of its input
+                return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
                 
             except Exception as e:
                 if attempt < Config.MAX_RETRIES - 1:
                     logger.warning(f"Embedding generation failed (attempt {attempt + 1}): {e}")
-                    time.sleep(Config.RETRY_DELAY * (attempt + 1))
+                    time.sleep(retry_wait(attempt))
                 else:
-                    logger.error(f"Failed to generate embedding after {Config.MAX_RETRIES} attempts: {e}")
-                    return None
+                    logger.error(f"Failed to generate embeddings after {Config.MAX_RETRIES} attempts: {e}")
+        
+        return None
+    
+    async def _request_embedding_batches(self, batches: List[List[str]]) -> List[Optional[List[List[float]]]]:
+        """
+        Embed several batches concurrently
+        
+        At most _MAX_CONCURRENT_EMBEDDING_REQUESTS requests are in flight.
+        Must not be called from a running event loop.
+        
+        Args:
+            batches: Batches of texts to embed (already truncated)
+            
+        Returns:
+            Embedding vectors for each batch (None for batches that failed)
+        """
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_EMBEDDING_REQUESTS)
+        
+        # The async client's connections belong to the running event loop,
+        # so it is opened per call rather than kept on the instance
+        async with AsyncAzureOpenAI(
+            azure_endpoint=Config.AZURE_OPENAI_ENDPOINT,
+            api_key=Config.AZURE_OPENAI_KEY,
+            api_version=Config.AZURE_OPENAI_API_VERSION
+        ) as client:
+            return list(await asyncio.gather(*(
+                self._request_embeddings_async(client, semaphore, batch) for batch in batches
+            )))
     
-    def _prepare_documents(self, file_path: str) -> Optional[List[Dict[str, Any]]]:
+    async def _request_embeddings_async(
+        self,
+        client: AsyncAzureOpenAI,
+        semaphore: asyncio.Semaphore,
+        inputs: List[str]
+    ) -> Optional[List[List[float]]]:
+        """Embed a batch of inputs on the async client (see _request_embeddings)"""
+        async with semaphore:
+            for attempt in range(Config.MAX_RETRIES):
+                try:
+                    response = await client.embeddings.create(
+                        input=inputs,
+                        model=Config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT
+                    )
+                    self.stats["embedding_api_calls"] += 1
+                    return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+                    
+                except Exception as e:
+                    if attempt < Config.MAX_RETRIES - 1:
+                        logger.warning(f"Embedding generation failed (attempt {attempt + 1}): {e}")
+                        await asyncio.sleep(retry_wait(attempt))
+                    else:
+                        logger.error(f"Failed to generate embeddings after {Config.MAX_RETRIES} attempts: {e}")
+        
+        return None
+    
+    def _prepare_documents(self, file_path: Union[str, FileContext]) -> Optional[List[Dict[str, Any]]]:
         """
         Prepare documents with chunks and embeddings
         
         Args:
-            file_path: Path to the file
+            file_path: Path to the file, or its FileContext
+            
+        Returns:
+            List of document dictionaries or None if preparation fails
+        """
+        documents = self._prepare_chunk_documents(file_path)
+        if not documents:
+            return None
+        
+        # Generate embeddings for all chunks in as few calls as possible
+        embeddings = self.generate_embeddings_batch([document["chunk"] for document in documents])
+        return self._attach_embeddings(documents, embeddings)
+    
+    def _prepare_chunk_documents(self, file_path: Union[str, FileContext]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Prepare a document for each chunk of a file, without embeddings
+        
+        Args:
+            file_path: Path to the file, or its FileContext
             
         Returns:
             List of document dictionaries or None if preparation fails
         """
         try:
+            # Stat the file once for both extraction calls
+            if isinstance(file_path, FileContext):
+                ctx = file_path
+            else:
+                ctx = FileContext.from_path(file_path)
+            file_path = ctx.path
+            
             # Extract metadata
-            metadata = self.extractor.extract_metadata(file_path)
+            metadata = self.extractor.extract_metadata(ctx)
             
             # Extract content
-            content = self.extractor.extract_text(file_path)
+            content = self.extractor.extract_text(ctx)
             
             if not content or len(content.strip()) < 10:
                 logger.warning(f"No meaningful content extracted from {file_path}")
@@ -278,50 +635,52 @@ class VectorIndexer:
             
             # Chunk the content
             chunks = self.chunk_text(content)
-            logger.info(f"Created {len(chunks)} chunks from {os.path.basename(file_path)}")
+            logger.info(f"Created {len(chunks)} chunks from {ctx.name}")
+            
+            # The extension is already resolved, so strip it rather than re-split
+            file_name = metadata["file_name"]
+            stem = file_name[:len(file_name) - len(ctx.ext)] if ctx.ext else file_name
+            
+            # Fields shared by every chunk of the file are built once; each
+            # chunk document copies references to them, not the values
+            file_fields = {
+                "totalChunks": len(chunks),
+                "title": metadata.get("document_title") or stem,
+                "name": file_name,
+                "filePath": file_path,
+                "extension": metadata["file_extension"],
+                "size": metadata["file_size_bytes"],
+                "createdDateTime": metadata["created_time"],
+                "modifiedDateTime": metadata["modified_time"],
+                "createdBy": metadata.get("owner", "Unknown"),
+                "lastModifiedBy": metadata.get("owner", "Unknown"),
+                "fileType": "File",
+                "url": file_path,
+            }
+            
+            # Add document-specific metadata if available
+            if "document_author" in metadata:
+                file_fields["author"] = metadata["document_author"]
             
             # Prepare documents for each chunk
             documents = []
             for i, chunk in enumerate(chunks):
-                # Generate embedding
-                embedding = self.generate_embedding(chunk)
-                
-                if not embedding:
-                    logger.warning(f"Skipping chunk {i + 1} due to embedding failure")
-                    continue
-                
                 # Generate unique ID for this chunk
                 chunk_id = hashlib.md5(f"{file_path}_chunk_{i}".encode()).hexdigest()
                 
-                # Prepare document
                 document = {
                     "id": chunk_id,
-                    "content": content[:50000],  # Store full content in first chunk
                     "chunk": chunk,
-                    "contentVector": embedding,
                     "chunkNumber": i,
-                    "totalChunks": len(chunks),
-                    "title": metadata.get("document_title") or os.path.splitext(metadata["file_name"])[0],
-                    "name": metadata["file_name"],
-                    "filePath": file_path,
-                    "extension": metadata["file_extension"],
-                    "size": metadata["file_size_bytes"],
-                    "createdDateTime": metadata["created_time"],
-                    "modifiedDateTime": metadata["modified_time"],
-                    "createdBy": metadata.get("owner", "Unknown"),
-                    "lastModifiedBy": metadata.get("owner", "Unknown"),
-                    "fileType": "File",
-                    "url": file_path,
+                    **file_fields,
                 }
-                
-                # Add document-specific metadata if available
-                if "document_author" in metadata:
-                    document["author"] = metadata["document_author"]
-                
                 documents.append(document)
-                self.stats["total_embeddings"] += 1
             
-            self.stats["total_chunks"] += len(documents)
+            # Store full content with the first chunk only; later chunks
+            # leave the field empty rather than repeating it.
+            # _attach_embeddings() moves it if that chunk is dropped
+            documents[0]["content"] = content[:50000]
+            
             return documents
             
         except ExtractionError as e:
@@ -331,6 +690,41 @@ class VectorIndexer:
             logger.error(f"Unexpected error preparing {file_path}: {e}")
             return None
     
+    def _attach_embeddings(
+        self,
+        documents: List[Dict[str, Any]],
+        embeddings: List[Optional[List[float]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Add embeddings to chunk documents, dropping chunks without one
+        
+        The file content carried by the first chunk moves to the first
+        chunk that is kept, so it is not lost with a dropped chunk.
+        
+        Args:
+            documents: Chunk documents from _prepare_chunk_documents()
+            embeddings: Embedding for each document (None if it failed)
+            
+        Returns:
+            Documents that received an embedding
+        """
+        content = documents[0].pop("content", None) if documents else None
+        
+        embedded = []
+        for document, embedding in zip(documents, embeddings):
+            if not embedding:
+                logger.warning(f"Skipping chunk {document['chunkNumber'] + 1} due to embedding failure")
+                continue
+            
+            document["contentVector"] = embedding
+            if not embedded and content is not None:
+                document["content"] = content
+            embedded.append(document)
+            self.stats["total_embeddings"] += 1
+        
+        self.stats["total_chunks"] += len(embedded)
+        return embedded
+    
     def index_file(self, file_path: str) -> int:
         """
         Index a single file with chunking and embeddings
@@ -342,50 +736,92 @@ class VectorIndexer:
             Number of chunks successfully indexed
         """
         try:
-            logger.info(f"Processing: {os.path.basename(file_path)}")
+            # Stat once for the checks and extraction
+            ctx = FileContext.from_path(file_path)
+        except OSError as e:
+            logger.error(f"Error indexing {file_path}: {e}")
+            self.stats["failed_files"] += 1
+            return 0
+        
+        # Check if should index
+        if not self._should_index_file(file_path, ctx.stat):
+            return 0
+        
+        return self._index_file(ctx)
+    
+    def _index_file(self, ctx: FileContext) -> int:
+        """
+        Index a file that already passed _should_index_file()
+        
+        Args:
+            ctx: The file to index
             
-            # Check if should index
-            if not self._should_index_file(file_path):
-                return 0
+        Returns:
+            Number of chunks successfully indexed
+        """
+        try:
+            logger.info(f"Processing: {ctx.name}")
             
             # Prepare documents
-            documents = self._prepare_documents(file_path)
+            documents = self._prepare_documents(ctx)
             if not documents:
                 self.stats["failed_files"] += 1
                 return 0
             
-            # Upload in batches
-            batch_size = Config.BATCH_SIZE
-            successful_chunks = 0
+            return self._upload_file_documents(ctx, documents)
             
-            for i in range(0, len(documents), batch_size):
-                batch = documents[i:i + batch_size]
-                
-                try:
-                    result = self.search_client.upload_documents(documents=batch)
-                    successful_chunks += sum(1 for r in result if r.succeeded)
-                except Exception as e:
-                    logger.error(f"Failed to upload batch: {e}")
+        except Exception as e:
+            logger.error(f"Error indexing {ctx.path}: {e}")
+            self.stats["failed_files"] += 1
+            return 0
+    
+    def _upload_file_documents(self, ctx: FileContext, documents: List[Dict[str, Any]]) -> int:
+        """
+        Upload the chunk documents of a file in batches and record the result
+        
+        The cache and size statistics use the stat taken before the file
+        was read, so recording the result costs no further syscalls.
+        
+        Args:
+            ctx: The file the documents came from
+            documents: Chunk documents with embeddings
             
-            if successful_chunks > 0:
-                logger.info(f"✅ Indexed {successful_chunks}/{len(documents)} chunks from {os.path.basename(file_path)}")
-                self.stats["successful_files"] += 1
-                
-                # Update cache
-                if Config.INCREMENTAL_INDEXING:
-                    self.indexed_files_cache[file_path] = os.path.getmtime(file_path)
-                
-                # Update size statistics
-                self.stats["total_size_mb"] += os.path.getsize(file_path) / (1024 * 1024)
-            else:
-                logger.error(f"❌ Failed to index any chunks from {os.path.basename(file_path)}")
-                self.stats["failed_files"] += 1
+        Returns:
+            Number of chunks successfully indexed
+        """
+        # Upload in batches, several at once when there is more than one
+        batch_size = Config.BATCH_SIZE
+        batches = [documents[i:i + batch_size] for i in range(0, len(documents), batch_size)]
+        
+        if len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=min(Config.UPLOAD_CONCURRENCY, len(batches))) as pool:
+                successful_chunks = sum(pool.map(self._upload_batch, batches))
+        else:
+            successful_chunks = sum(map(self._upload_batch, batches))
+        
+        if successful_chunks > 0:
+            logger.info(f"✅ Indexed {successful_chunks}/{len(documents)} chunks from {ctx.name}")
+            self.stats["successful_files"] += 1
             
-            return successful_chunks
+            # Update cache
+            if Config.INCREMENTAL_INDEXING:
+                self._record_indexed_file(ctx.path, ctx.stat.st_mtime)
             
-        except Exception as e:
-            logger.error(f"Error indexing {file_path}: {e}")
+            # Update size statistics
+            self.stats["total_size_mb"] += ctx.stat.st_size / (1024 * 1024)
+        else:
+            logger.error(f"❌ Failed to index any chunks from {ctx.name}")
             self.stats["failed_files"] += 1
+        
+        return successful_chunks
+    
+    def _upload_batch(self, batch: List[Dict[str, Any]]) -> int:
+        """Upload one batch of chunk documents, returning how many succeeded"""
+        try:
+            result = self.search_client.upload_documents(documents=batch)
+            return sum(1 for r in result if r.succeeded)
+        except Exception as e:
+            logger.error(f"Failed to upload batch: {e}")
             return 0
     
     def index_directory(
@@ -421,36 +857,57 @@ class VectorIndexer:
         self.stats["start_time"] = datetime.now()
         
         # Collect all files to index
-        files_to_index = []
+        files_to_index = self._find_files(directory_path, recursive)
         
-        if recursive:
-            for root, dirs, files in os.walk(directory_path):
-                # Skip excluded directories
-                dirs[:] = [d for d in dirs if d not in Config.EXCLUDE_DIRECTORIES]
-                
-                for file in files:
-                    ext = os.path.splitext(file)[1].lower()
-                    if ext in Config.SUPPORTED_EXTENSIONS:
-                        files_to_index.append(os.path.join(root, file))
-        else:
-            for file in os.listdir(directory_path):
-                file_path = os.path.join(directory_path, file)
-                if os.path.isfile(file_path):
-                    ext = os.path.splitext(file)[1].lower()
-                    if ext in Config.SUPPORTED_EXTENSIONS:
-                        files_to_index.append(file_path)
-        
-        self.stats["total_files"] = len(files_to_index)
-        logger.info(f"Found {len(files_to_index)} files to process")
-        
-        # Index files with progress bar
-        if show_progress:
-            iterator = tqdm(files_to_index, desc="Indexing files", unit="file")
-        else:
-            iterator = files_to_index
+        # Progress is counted as files finish uploading
+        progress = tqdm(total=len(files_to_index), desc="Indexing files", unit="file") if show_progress else None
+        
+        # Pipeline: this thread extracts and chunks files, one thread embeds
+        # them and another uploads, so extracting a file overlaps the
+        # network calls for the files before it. A file that fails at any
+        # stage travels on with documents=None and is counted by the uploader
+        embed_queue = queue.Queue(maxsize=_PIPELINE_QUEUE_SIZE)
+        upload_queue = queue.Queue(maxsize=_PIPELINE_QUEUE_SIZE)
         
-        for file_path in iterator:
-            self.index_file(file_path)
+        def embed_documents():
+            for ctx, documents in iter(embed_queue.get, None):
+                if documents:
+                    try:
+                        embeddings = self.generate_embeddings_batch([document["chunk"] for document in documents])
+                        documents = self._attach_embeddings(documents, embeddings)
+                    except Exception as e:
+                        logger.error(f"Error embedding {ctx.path}: {e}")
+                        documents = None
+                upload_queue.put((ctx, documents))
+            upload_queue.put(None)
+        
+        def upload_documents():
+            for ctx, documents in iter(upload_queue.get, None):
+                try:
+                    if documents:
+                        self._upload_file_documents(ctx, documents)
+                    else:
+                        self.stats["failed_files"] += 1
+                except Exception as e:
+                    logger.error(f"Error indexing {ctx.path}: {e}")
+                    self.stats["failed_files"] += 1
+                if progress is not None:
+                    progress.update()
+        
+        embedder = threading.Thread(target=embed_documents, name="vector-embed", daemon=True)
+        uploader = threading.Thread(target=upload_documents, name="vector-upload", daemon=True)
+        embedder.start()
+        uploader.start()
+        try:
+            for ctx in files_to_index:
+                logger.info(f"Processing: {ctx.name}")
+                embed_queue.put((ctx, self._prepare_chunk_documents(ctx)))
+        finally:
+            embed_queue.put(None)
+            embedder.join()
+            uploader.join()
+            if progress is not None:
+                progress.close()
         
         self.stats["end_time"] = datetime.now()
         
@@ -465,6 +922,183 @@ class VectorIndexer:
         
         return self.stats.copy()
     
+    def index_directory_batch(
+        self,
+        directory_path: Optional[str] = None,
+        recursive: bool = True,
+        poll_interval: int = 60
+    ) -> Dict[str, Any]:
+        """
+        Index all supported files in a directory, embedding through the Batch API
+        
+        All files are chunked first; chunks without a cached embedding
+        are then embedded by Azure OpenAI batch jobs instead of real-time
+        requests, which have higher rate limits and lower cost but may take
+        up to 24 hours. Requires a Global Batch deployment of the embedding
+        model. Documents are uploaded once the jobs finish.
+        
+        Args:
+            directory_path: Path to directory (defaults to config value)
+            recursive: Whether to index subdirectories
+            poll_interval: Seconds between batch job status checks
+            
+        Returns:
+            Statistics dictionary
+        """
+        directory_path = directory_path or Config.FILE_SHARE_PATH
+        
+        logger.info(f"Starting batch vector indexing from: {directory_path}")
+        
+        self.stats["start_time"] = datetime.now()
+        
+        # Chunk every file that needs indexing
+        prepared = []
+        for ctx in self._find_files(directory_path, recursive):
+            documents = self._prepare_chunk_documents(ctx)
+            if documents:
+                prepared.append((ctx, documents))
+            else:
+                self.stats["failed_files"] += 1
+        
+        # Serve what we can from the embedding cache; batch the rest
+        embeddings = {}
+        missing = {}
+        for _, documents in prepared:
+            for document in documents:
+                embedding = self._cached_embedding(_embedding_key(document["chunk"]))
+                if embedding is not None:
+                    embeddings[document["id"]] = embedding
+                else:
+                    missing[document["id"]] = document["chunk"]
+        
+        if missing:
+            embeddings.update(self._run_embedding_batches(missing, poll_interval))
+        
+        # Upload each file's chunks
+        for ctx, documents in prepared:
+            documents = self._attach_embeddings(documents, [embeddings.get(document["id"]) for document in documents])
+            if not documents:
+                logger.error(f"❌ No embeddings for {ctx.name}")
+                self.stats["failed_files"] += 1
+                continue
+            
+            try:
+                self._upload_file_documents(ctx, documents)
+            except Exception as e:
+                logger.error(f"Error indexing {ctx.path}: {e}")
+                self.stats["failed_files"] += 1
+        
+        self.stats["end_time"] = datetime.now()
+        
+        # Save caches
+        if Config.CACHE_EMBEDDINGS:
+            self._save_embedding_cache()
+        if Config.INCREMENTAL_INDEXING:
+            self._save_indexed_files_cache()
+        
+        # Print summary
+        self._print_summary()
+        
+        return self.stats.copy()
+    
+    def _run_embedding_batches(self, texts: Dict[str, str], poll_interval: int) -> Dict[str, List[float]]:
+        """
+        Embed texts with Azure OpenAI batch jobs and wait for the results
+        
+        Args:
+            texts: Texts to embed keyed by an ID (the chunk document ID)
+            poll_interval: Seconds between batch job status checks
+            
+        Returns:
+            Embedding vectors keyed by ID for the texts that were embedded
+        """
+        batch_dir = Path(Config.CACHE_DIR)
+        batch_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Submit every job before waiting, so they run side by side
+        ids = list(texts)
+        jobs = []
+        for start in range(0, len(ids), _BATCH_JOB_MAX_REQUESTS):
+            batch_file = batch_dir / f"{self.index_name}_embeddings_batch_{len(jobs)}.jsonl"
+            with open(batch_file, 'w', encoding='utf-8') as f:
+                for custom_id in ids[start:start + _BATCH_JOB_MAX_REQUESTS]:
+                    f.write(json.dumps({
+                        "custom_id": custom_id,
+                        "method": "POST",
+                        "url": "/v1/embeddings",
+                        "body": {
+                            "model": Config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT,
+                            "input": self._truncate_for_embedding(texts[custom_id])
+                        }
+                    }) + "\n")
+            
+            with open(batch_file, 'rb') as f:
+                input_file = self.openai_client.files.create(file=f, purpose="batch")
+            
+            job = self.openai_client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/embeddings",
+                completion_window="24h"
+            )
+            logger.info(f"Submitted embedding batch {job.id} ({len(ids[start:start + _BATCH_JOB_MAX_REQUESTS])} chunks)")
+            jobs.append(job)
+        
+        embeddings = {}
+        for job in jobs:
+            while job.status not in _BATCH_FINAL_STATUSES:
+                time.sleep(poll_interval)
+                job = self.openai_client.batches.retrieve(job.id)
+                logger.debug(f"Embedding batch {job.id}: {job.status}")
+            
+            if job.status != "completed" or not job.output_file_id:
+                logger.error(f"Embedding batch {job.id} ended with status: {job.status}")
+                continue
+            
+            self.stats["embedding_api_calls"] += 1
+            
+            for line in self.openai_client.files.content(job.output_file_id).text.splitlines():
+                result = json.loads(line)
+                response = result.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+                
+                embedding = response["body"]["data"][0]["embedding"]
+                embeddings[result["custom_id"]] = embedding
+                
+                # Cache the embedding
+                self._cache_embedding(_embedding_key(texts[result["custom_id"]]), embedding)
+        
+        if len(embeddings) < len(texts):
+            logger.warning(f"Batch embedding failed for {len(texts) - len(embeddings)} of {len(texts)} chunks")
+        
+        return embeddings
+    
+    def _find_files(self, directory_path: str, recursive: bool) -> List[FileContext]:
+        """
+        Collect the supported files in a directory that need indexing
+        
+        The stat result from each directory entry settles the size and
+        incremental checks, so unchanged files cost no further syscalls.
+        
+        Args:
+            directory_path: Path to directory
+            recursive: Whether to include subdirectories
+            
+        Returns:
+            List of files to index
+        """
+        files = list(ContentExtractor.iter_files(
+            directory_path,
+            Config.SUPPORTED_EXTENSIONS,
+            Config.EXCLUDE_DIRECTORIES,
+            recursive
+        ))
+        
+        self.stats["total_files"] = len(files)
+        logger.info(f"Found {len(files)} files to process")
+        
+        return [ctx for ctx in files if self._should_index_file(ctx.path, ctx.stat)]
+    
     def _print_summary(self):
         """Print indexing summary"""
         duration = (self.stats["end_time"] - self.stats["start_time"]).total_seconds()
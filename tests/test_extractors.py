@@ -5,10 +5,14 @@ Author: Edgar McOchieng
 """
 
 import unittest
+import mmap
 import os
 from pathlib import Path
 import tempfile
-from src.extractors import ContentExtractor, ExtractionError
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+import openpyxl
+from src.extractors import ContentExtractor, ExtractionError, FileContext
 
 
 class TestContentExtractor(unittest.TestCase):
@@ -39,6 +43,32 @@ class TestContentExtractor(unittest.TestCase):
         # Assert
         self.assertEqual(content, test_content)
     
+    def test_extract_text_from_large_txt(self):
+        """Test large text files are memory-mapped and decode correctly"""
+        test_file = os.path.join(self.temp_dir, "large.log")
+        test_content = "Line with accents: é, ñ, ü\n" * 10
+        
+        with open(test_file, 'w', encoding='utf-8', newline='') as f:
+            f.write(test_content)
+        
+        # Lower the threshold rather than writing a large file
+        with patch("src.extractors._MMAP_MIN_SIZE", 16), \
+                patch("src.extractors.mmap.mmap", wraps=mmap.mmap) as mock_mmap:
+            content = self.extractor.extract_text(test_file)
+        
+        mock_mmap.assert_called_once()
+        self.assertEqual(content, test_content)
+    
+    def test_extract_text_translates_line_endings(self):
+        """Test CRLF and CR line endings come back as LF"""
+        test_file = os.path.join(self.temp_dir, "windows.txt")
+        
+        with open(test_file, 'wb') as f:
+            f.write(b"first\r\nsecond\rthird\r\n" * 10)
+        
+        self.assertEqual(self.extractor.extract_text(test_file), "first\nsecond\nthird\n" * 10)
+        self.assertEqual(self.extractor.extract_text(test_file, max_chars=8), "first\nse")
+    
     def test_extract_text_unsupported_format(self):
         """Test extraction fails for unsupported format"""
         test_file = os.path.join(self.temp_dir, "test.xyz")
@@ -67,6 +97,43 @@ class TestContentExtractor(unittest.TestCase):
         self.assertEqual(metadata["file_name"], "test.txt")
         self.assertEqual(metadata["file_extension"], ".txt")
     
+    def test_extract_with_file_context(self):
+        """Test extraction from a FileContext reuses its stat result"""
+        test_file = os.path.join(self.temp_dir, "test.md")
+        
+        with open(test_file, 'w', encoding='utf-8') as f:
+            f.write("# Heading")
+        
+        ctx = FileContext.from_path(test_file)
+        self.assertEqual(ctx.ext, ".md")
+        self.assertEqual(ctx.name, "test.md")
+        
+        with patch("src.extractors.os.stat") as mock_stat:
+            metadata = self.extractor.extract_metadata(ctx)
+            content = self.extractor.extract_text(ctx)
+        
+        mock_stat.assert_not_called()
+        self.assertEqual(content, "# Heading")
+        self.assertEqual(metadata["file_size_bytes"], ctx.stat.st_size)
+    
+    def test_iter_files(self):
+        """Test directory walk filters extensions and excluded directories"""
+        for relative in ["a.txt", "b.xyz", os.path.join("sub", "c.pdf"), os.path.join("skip", "d.txt")]:
+            path = os.path.join(self.temp_dir, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write("test")
+        
+        found = ContentExtractor.iter_files(self.temp_dir, extensions={".txt", ".pdf"}, exclude_dirs={"skip"})
+        contexts = {os.path.relpath(ctx.path, self.temp_dir): ctx for ctx in found}
+        
+        self.assertEqual(set(contexts), {"a.txt", os.path.join("sub", "c.pdf")})
+        self.assertEqual(contexts["a.txt"].ext, ".txt")
+        self.assertEqual(contexts["a.txt"].stat.st_size, 4)
+        
+        top_level = ContentExtractor.iter_files(self.temp_dir, recursive=False)
+        self.assertEqual({ctx.name for ctx in top_level}, {"a.txt", "b.xyz"})
+    
     def test_get_statistics(self):
         """Test statistics tracking"""
         test_file = os.path.join(self.temp_dir, "test.txt")
@@ -86,6 +153,104 @@ class TestContentExtractor(unittest.TestCase):
         self.assertEqual(stats["failed"], 0)
         self.assertEqual(stats["by_type"][".txt"], 1)
     
+    def test_iter_files_extension_matches_splitext(self):
+        """Test extensions found by iter_files match os.path.splitext"""
+        names = ["a.TXT", "README", ".txt", "b.", "c.tar.Gz", "..d"]
+        for name in names:
+            open(os.path.join(self.temp_dir, name), 'w').close()
+        
+        found = {ctx.name: ctx.ext for ctx in ContentExtractor.iter_files(self.temp_dir)}
+        
+        self.assertEqual(found, {name: os.path.splitext(name)[1].lower() for name in names})
+    
+    def test_extract_many(self):
+        """Test parallel extraction of several files"""
+        paths = []
+        for i in range(3):
+            test_file = os.path.join(self.temp_dir, f"test{i}.txt")
+            with open(test_file, 'w', encoding='utf-8') as f:
+                f.write(f"document {i}")
+            paths.append(test_file)
+        
+        # Unsupported files are left out of the result
+        bad_file = os.path.join(self.temp_dir, "test.xyz")
+        with open(bad_file, 'w') as f:
+            f.write("test")
+        
+        results = self.extractor.extract_many(paths + [bad_file])
+        
+        self.assertEqual(results, {path: f"document {i}" for i, path in enumerate(paths)})
+        stats = self.extractor.get_statistics()
+        self.assertEqual(stats["total_extracted"], 3)
+        self.assertEqual(stats["by_type"][".txt"], 3)
+    
+    def test_broken_process_pool_replaced(self):
+        """Test the shared pool is restarted after a worker dies"""
+        pool = ContentExtractor._get_process_pool()
+        with self.assertRaises(BrokenProcessPool):
+            pool.submit(os._exit, 1).result()
+        
+        test_file = os.path.join(self.temp_dir, "test.txt")
+        with open(test_file, 'w', encoding='utf-8') as f:
+            f.write("document")
+        
+        self.assertEqual(self.extractor.extract_many([test_file]), {test_file: "document"})
+        self.assertIsNot(ContentExtractor._get_process_pool(), pool)
+    
+    def test_document_parsed_once_for_text_and_metadata(self):
+        """Test metadata and text extraction share one parse of the file"""
+        test_file = os.path.join(self.temp_dir, "test.xlsx")
+        wb = openpyxl.Workbook()
+        wb.active.title = "Data"
+        wb.active.append(["name", "value"])
+        wb.save(test_file)
+        
+        with patch("openpyxl.load_workbook", wraps=openpyxl.load_workbook) as load:
+            metadata = self.extractor.extract_metadata(test_file)
+            content = self.extractor.extract_text(test_file)
+        
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(metadata["sheet_names"], ["Data"])
+        self.assertIn("name | value", content)
+    
+    def test_extract_iter(self):
+        """Test streamed extraction yields one piece per sheet"""
+        test_file = os.path.join(self.temp_dir, "test.xlsx")
+        wb = openpyxl.Workbook()
+        wb.active.title = "First"
+        wb.active.append(["a", 1])
+        wb.create_sheet("Second").append(["b", 2])
+        wb.save(test_file)
+        
+        pieces = list(self.extractor.extract_iter(test_file))
+        
+        self.assertEqual(len(pieces), 2)
+        self.assertEqual(''.join(pieces), ContentExtractor().extract_text(test_file))
+        self.assertEqual(self.extractor.get_statistics()["by_type"][".xlsx"], 1)
+    
+    def test_extract_text_max_chars(self):
+        """Test max_chars truncates text, including part way through a character"""
+        test_file = os.path.join(self.temp_dir, "test.txt")
+        with open(test_file, 'w', encoding='utf-8') as f:
+            f.write("€" * 1000)
+        
+        self.assertEqual(self.extractor.extract_text(test_file, max_chars=5), "€" * 5)
+        self.assertEqual(self.extractor.extract_text(test_file, max_chars=5000), "€" * 1000)
+    
+    def test_extract_document_max_chars(self):
+        """Test max_chars stops parsing a document early"""
+        test_file = os.path.join(self.temp_dir, "test.xlsx")
+        wb = openpyxl.Workbook()
+        wb.active.title = "First"
+        wb.active.append(["a", 1])
+        wb.create_sheet("Second").append(["b", 2])
+        wb.save(test_file)
+        
+        content = self.extractor.extract_text(test_file, max_chars=10)
+        
+        self.assertEqual(content, "[Sheet: First]"[:10])
+        self.assertEqual(len(self.extractor._parse_cache), 0)
+    
     def test_extract_text_encoding_handling(self):
         """Test handling of different text encodings"""
         test_file = os.path.join(self.temp_dir, "test_utf16.txt")
@@ -5,37 +5,54 @@ Author: Edgar McOchieng
 """
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock
-from src.index_manager import IndexManager
+from unittest.mock import DEFAULT, Mock, patch, MagicMock
+from src.index_manager import IndexManager, get_manager
+
+
+# Config values every test starts from
+BASE_CONFIG = {
+    "AZURE_SEARCH_ENDPOINT": "https://test.search.windows.net",
+    "AZURE_SEARCH_KEY": "test-key",
+    "AZURE_SEARCH_API_VERSION": "2023-11-01",
+    "AZURE_SEARCH_INDEX_NAME": "test-index",
+    "AZURE_SEARCH_VECTOR_INDEX_NAME": "test-vector-index",
+    "EMBEDDING_DIMENSIONS": 3072,
+    "MAX_RETRIES": 3,
+    "RETRY_DELAY": 1,
+    "MAX_WORKERS": 4,
+}
 
 
 class TestIndexManager(unittest.TestCase):
     """Test cases for IndexManager class"""
     
-    @patch('src.index_manager.Config')
-    def test_index_manager_initialization(self, mock_config):
+    @classmethod
+    def setUpClass(cls):
+        """Patch Config and the HTTP session once for the class"""
+        patcher = patch.multiple('src.index_manager', Config=DEFAULT, get_http_session=DEFAULT, autospec=True, spec_set=True)
+        mocks = patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        cls.mock_config = mocks['Config']
+        cls.mock_session = mocks['get_http_session']
+    
+    def setUp(self):
+        """Reset the shared mocks"""
+        self.mock_config.configure_mock(**BASE_CONFIG)
+        self.mock_session.reset_mock(return_value=True, side_effect=True)
+    
+    def test_index_manager_initialization(self):
         """Test index manager initializes correctly"""
-        mock_config.AZURE_SEARCH_ENDPOINT = "https://test.search.windows.net"
-        mock_config.AZURE_SEARCH_KEY = "test-key"
-        mock_config.AZURE_SEARCH_API_VERSION = "2023-11-01"
-        
         manager = IndexManager()
         
         self.assertEqual(manager.endpoint, "https://test.search.windows.net")
         self.assertEqual(manager.api_key, "test-key")
     
-    @patch('src.index_manager.requests.post')
-    @patch('src.index_manager.Config')
-    def test_create_standard_index_success(self, mock_config, mock_post):
+    def test_create_standard_index_success(self):
         """Test successful standard index creation"""
-        mock_config.AZURE_SEARCH_ENDPOINT = "https://test.search.windows.net"
-        mock_config.AZURE_SEARCH_KEY = "test-key"
-        mock_config.AZURE_SEARCH_API_VERSION = "2023-11-01"
-        mock_config.AZURE_SEARCH_INDEX_NAME = "test-index"
-        
         # Mock successful response
         mock_response = MagicMock()
         mock_response.status_code = 201
+        mock_post = self.mock_session.return_value.post
         mock_post.return_value = mock_response
         
         manager = IndexManager()
@@ -44,19 +61,12 @@ class TestIndexManager(unittest.TestCase):
         self.assertTrue(result)
         mock_post.assert_called_once()
     
-    @patch('src.index_manager.requests.post')
-    @patch('src.index_manager.Config')
-    def test_create_vector_index_success(self, mock_config, mock_post):
+    def test_create_vector_index_success(self):
         """Test successful vector index creation"""
-        mock_config.AZURE_SEARCH_ENDPOINT = "https://test.search.windows.net"
-        mock_config.AZURE_SEARCH_KEY = "test-key"
-        mock_config.AZURE_SEARCH_API_VERSION = "2023-11-01"
-        mock_config.AZURE_SEARCH_VECTOR_INDEX_NAME = "test-vector-index"
-        mock_config.EMBEDDING_DIMENSIONS = 3072
-        
         # Mock successful response
         mock_response = MagicMock()
         mock_response.status_code = 201
+        mock_post = self.mock_session.return_value.post
         mock_post.return_value = mock_response
         
         manager = IndexManager()
@@ -65,14 +75,23 @@ class TestIndexManager(unittest.TestCase):
         self.assertTrue(result)
         mock_post.assert_called_once()
     
-    @patch('src.index_manager.requests.get')
-    @patch('src.index_manager.Config')
-    def test_list_indexes(self, mock_config, mock_get):
-        """Test listing indexes"""
-        mock_config.AZURE_SEARCH_ENDPOINT = "https://test.search.windows.net"
-        mock_config.AZURE_SEARCH_KEY = "test-key"
-        mock_config.AZURE_SEARCH_API_VERSION = "2023-11-01"
+    @patch('src.index_manager.orjson')
+    def test_request_body_encoded_with_orjson(self, mock_orjson):
+        """Test JSON bodies are pre-encoded when orjson is available"""
+        mock_orjson.dumps.return_value = b'{"name":"test-index"}'
+        
+        mock_post = self.mock_session.return_value.post
+        mock_post.return_value = MagicMock(status_code=201)
         
+        IndexManager().create_standard_index("test-index")
+        
+        body = mock_orjson.dumps.call_args[0][0]
+        self.assertEqual(body["name"], "test-index")
+        self.assertEqual(mock_post.call_args.kwargs["data"], b'{"name":"test-index"}')
+        self.assertNotIn("json", mock_post.call_args.kwargs)
+    
+    def test_list_indexes(self):
+        """Test listing indexes"""
         # Mock response
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -82,7 +101,7 @@ class TestIndexManager(unittest.TestCase):
                 {'name': 'index2'}
             ]
         }
-        mock_get.return_value = mock_response
+        self.mock_session.return_value.get.return_value = mock_response
         
         manager = IndexManager()
         indexes = manager.list_indexes()
@@ -91,17 +110,12 @@ class TestIndexManager(unittest.TestCase):
         self.assertIn('index1', indexes)
         self.assertIn('index2', indexes)
     
-    @patch('src.index_manager.requests.delete')
-    @patch('src.index_manager.Config')
-    def test_delete_index(self, mock_config, mock_delete):
+    def test_delete_index(self):
         """Test index deletion"""
-        mock_config.AZURE_SEARCH_ENDPOINT = "https://test.search.windows.net"
-        mock_config.AZURE_SEARCH_KEY = "test-key"
-        mock_config.AZURE_SEARCH_API_VERSION = "2023-11-01"
-        
         # Mock successful deletion
         mock_response = MagicMock()
         mock_response.status_code = 204
+        mock_delete = self.mock_session.return_value.delete
         mock_delete.return_value = mock_response
         
         manager = IndexManager()
@@ -109,6 +123,79 @@ class TestIndexManager(unittest.TestCase):
         
         self.assertTrue(result)
         mock_delete.assert_called_once()
+    
+    def test_session_reused_across_calls(self):
+        """Test one HTTP session serves repeated requests"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {'documentCount': 1}
+        self.mock_session.return_value.get.return_value = mock_response
+        
+        manager = IndexManager()
+        manager.get_index_statistics("index1")
+        manager.get_index_statistics("index2")
+        
+        self.mock_session.assert_called_once()
+        self.assertEqual(self.mock_session.return_value.get.call_count, 2)
+    
+    def test_get_all_index_statistics(self):
+        """Test statistics are fetched for every listed index"""
+        def fake_get(url, **kwargs):
+            response = MagicMock(status_code=200)
+            if url.endswith("/indexes?api-version=2023-11-01"):
+                response.json.return_value = {'value': [{'name': 'index1'}, {'name': 'index2'}]}
+            else:
+                response.json.return_value = {'documentCount': 2 if '/index2/' in url else 1}
+            return response
+        
+        self.mock_session.return_value.get.side_effect = fake_get
+        
+        stats = IndexManager().get_all_index_statistics()
+        
+        self.assertEqual(list(stats), ['index1', 'index2'])
+        self.assertEqual(stats['index1']['documentCount'], 1)
+        self.assertEqual(stats['index2']['documentCount'], 2)
+    
+    @patch('src.index_manager.time.sleep')
+    def test_throttled_request_retried(self, mock_sleep):
+        """Test 429 responses are retried after the Retry-After delay"""
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "5"})
+        deleted = MagicMock(status_code=204)
+        mock_delete = self.mock_session.return_value.delete
+        mock_delete.side_effect = [throttled, deleted]
+        
+        result = IndexManager().delete_index("test-index")
+        
+        self.assertTrue(result)
+        self.assertEqual(mock_delete.call_count, 2)
+        mock_sleep.assert_called_once_with(5.0)
+    
+    @patch('src.index_manager.time.sleep')
+    def test_retries_exhausted_returns_last_response(self, mock_sleep):
+        """Test persistent server errors fail after MAX_RETRIES attempts"""
+        mock_get = self.mock_session.return_value.get
+        mock_get.return_value = MagicMock(status_code=503, headers={})
+        
+        self.assertIsNone(IndexManager().get_index_statistics("test-index"))
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+    
+    def test_context_manager_closes_session(self):
+        """Test leaving the context releases the session's connections"""
+        self.mock_session.return_value.get.return_value = MagicMock(status_code=200)
+        
+        with IndexManager() as manager:
+            manager.get_index_statistics("index1")
+        
+        self.mock_session.return_value.close.assert_called_once()
+    
+    def test_get_manager_returns_singleton(self):
+        """Test get_manager returns the same instance"""
+        get_manager.cache_clear()
+        try:
+            self.assertIs(get_manager(), get_manager())
+        finally:
+            get_manager.cache_clear()
 
 
 if __name__ == '__main__':
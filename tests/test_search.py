@@ -5,49 +5,70 @@ Author: Edgar McOchieng
 """
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import DEFAULT, patch, MagicMock
 from src.search import SearchClient
 
 
-class TestSearchClient(unittest.TestCase):
+# Config values every test starts from
+BASE_CONFIG = {
+    "AZURE_SEARCH_ENDPOINT": "https://test.search.windows.net",
+    "AZURE_SEARCH_KEY": "test-key",
+    "AZURE_SEARCH_INDEX_NAME": "test-index",
+    "AZURE_SEARCH_VECTOR_INDEX_NAME": "test-vector-index",
+    "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com",
+    "AZURE_OPENAI_KEY": "test-key",
+    "AZURE_OPENAI_API_VERSION": "2024-05-01-preview",
+    "AZURE_OPENAI_EMBEDDING_DEPLOYMENT": "test-deployment",
+}
+
+# Mock results for the formatting tests
+SAMPLE_RESULTS = [
+    {
+        'name': 'test.pdf',
+        'filePath': '/path/to/test.pdf',
+        'extension': '.pdf',
+        '@search.score': 0.85,
+        'chunk': 'This is test content...'
+    }
+]
 
-        def test_format_results_empty(self):
-            """Test format_results returns 'No results found.' for empty input"""
-            search = SearchClient(use_vector_index=False)
-            result = search.format_results([])
-            self.assertEqual(result, "No results found.")
+
+class TestSearchClient(unittest.TestCase):
     """Test cases for SearchClient class"""
     
-    @patch('src.search.AzureSearchClient')
-    @patch('src.search.Config')
-    def test_search_client_initialization(self, mock_config, mock_search_client):
-        """Test search client initializes correctly"""
-        mock_config.AZURE_SEARCH_ENDPOINT = "https://test.search.windows.net"
-        mock_config.AZURE_SEARCH_KEY = "test-key"
-        mock_config.AZURE_SEARCH_VECTOR_INDEX_NAME = "test-index"
-        
-        search = SearchClient(use_vector_index=False)
+    @classmethod
+    def setUpClass(cls):
+        """Patch Config and the Azure client once and build a shared keyword client"""
+        patcher = patch.multiple('src.search', Config=DEFAULT, AzureSearchClient=DEFAULT, autospec=True, spec_set=True)
+        mocks = patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        cls.mock_config = mocks['Config']
+        cls.mock_search_client = mocks['AzureSearchClient']
+        cls.mock_config.configure_mock(**BASE_CONFIG)
         
-        self.assertIsNotNone(search.search_client)
+        # Shared by the tests that do not search or embed
+        cls.search = SearchClient(use_vector_index=False)
     
-    @patch('src.search.AzureSearchClient')
-    @patch('src.search.AzureOpenAI')
-    @patch('src.search.Config')
-    def test_generate_query_embedding(self, mock_config, mock_openai, mock_search_client):
+    def setUp(self):
+        """Undo config changes made by earlier tests"""
+        self.mock_config.configure_mock(**BASE_CONFIG)
+    
+    def test_search_client_initialization(self):
+        """Test search client initializes correctly"""
+        self.assertIsNotNone(self.search.search_client)
+        self.assertEqual(self.search.index_name, "test-index")
+    
+    @patch('src.search.AzureOpenAI', autospec=True, spec_set=True)
+    def test_generate_query_embedding(self, mock_openai):
         """Test query embedding generation"""
         # Setup mocks
         mock_client = MagicMock()
         mock_openai.return_value = mock_client
         
         mock_response = MagicMock()
-        mock_response.data = [MagicMock(embedding=[0.1] * 3072)]
+        mock_response.data = [MagicMock(embedding=[0.1, 0.2, 0.3])]
         mock_client.embeddings.create.return_value = mock_response
         
-        mock_config.AZURE_OPENAI_ENDPOINT = "https://test.openai.azure.com"
-        mock_config.AZURE_OPENAI_KEY = "test-key"
-        mock_config.AZURE_OPENAI_API_VERSION = "2024-05-01-preview"
-        mock_config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT = "test-deployment"
-        
         search = SearchClient()
         search.vector_enabled = True
         search.openai_client = mock_client
@@ -56,42 +77,55 @@ class TestSearchClient(unittest.TestCase):
         embedding = search.generate_query_embedding("test query")
         
         # Verify
-        self.assertIsNotNone(embedding)
-        self.assertEqual(len(embedding), 3072)
+        self.assertEqual(embedding, [0.1, 0.2, 0.3])
     
-    @patch('src.search.AzureSearchClient')
-    @patch('src.search.Config')
-    def test_format_results(self, mock_config, mock_search_client):
-        """Test result formatting"""
+    @patch('src.search.AzureOpenAI', autospec=True, spec_set=True)
+    def test_query_embedding_cached(self, mock_openai):
+        """Test repeated queries reuse the cached embedding"""
+        mock_client = MagicMock()
+        mock_client.embeddings.create.return_value = MagicMock(data=[MagicMock(embedding=[0.1, 0.2])])
+        
+        search = SearchClient()
+        search.vector_enabled = True
+        search.openai_client = mock_client
+        
+        first = search.generate_query_embedding("test query")
+        first.append(0.3)
+        second = search.generate_query_embedding("test query")
+        
+        self.assertEqual(second, [0.1, 0.2])
+        mock_client.embeddings.create.assert_called_once()
+    
+    def test_cached_results_keyed_on_query_vector(self):
+        """Test cached results depend on the query vector and are returned as copies"""
         search = SearchClient(use_vector_index=False)
+        search.vector_enabled = True
+        azure_search = search.search_client.search
+        azure_search.side_effect = lambda **kwargs: [{"vector": kwargs["vector_queries"][0].vector}]
         
-        # Mock results
-        results = [
-            {
-                'name': 'test.pdf',
-                'filePath': '/path/to/test.pdf',
-                'extension': '.pdf',
-                '@search.score': 0.85,
-                'chunk': 'This is test content...'
-            }
-        ]
+        first = search.vector_search("test query", 5, query_vector=[0.1])
+        second = search.vector_search("test query", 5, query_vector=[0.2])
+        first[0]["vector"] = None
+        repeated = search.vector_search("test query", 5, query_vector=[0.1])
         
-        formatted = search.format_results(results, show_scores=True)
+        self.assertEqual(second, [{"vector": [0.2]}])
+        self.assertEqual(repeated, [{"vector": [0.1]}])
+        self.assertEqual(azure_search.call_count, 2)
+    
+    def test_format_results(self):
+        """Test result formatting"""
+        formatted = self.search.format_results(SAMPLE_RESULTS, show_scores=True)
         
         # Check formatting
         self.assertIn('test.pdf', formatted)
         self.assertIn('0.85', formatted)
     
-    @patch('src.search.AzureSearchClient')
-    @patch('src.search.Config')
-    def test_format_empty_results(self, mock_config, mock_search_client):
+    def test_format_empty_results(self):
         """Test formatting of empty results"""
-        search = SearchClient(use_vector_index=False)
-        
-        formatted = search.format_results([])
+        formatted = self.search.format_results([])
         
         self.assertEqual(formatted, "No results found.")
 
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,198 @@
+"""
+Unit tests for vector indexer
+
+Author: Edgar McOchieng
+"""
+
+import unittest
+import asyncio
+import gzip
+import os
+import pickle
+import tempfile
+from unittest.mock import DEFAULT, MagicMock, patch
+from src.vector_indexer import VectorIndexer, _EMBEDDING_BATCH_SIZE, _embedding_key
+
+
+# Config values every test starts from; tests override what they need
+BASE_CONFIG = {
+    "AZURE_SEARCH_ENDPOINT": "https://test.search.windows.net",
+    "AZURE_SEARCH_KEY": "test-key",
+    "AZURE_SEARCH_VECTOR_INDEX_NAME": "test-vector-index",
+    "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com",
+    "AZURE_OPENAI_KEY": "test-key",
+    "AZURE_OPENAI_API_VERSION": "2024-05-01-preview",
+    "AZURE_OPENAI_EMBEDDING_DEPLOYMENT": "test-deployment",
+    "CACHE_EMBEDDINGS": False,
+    "INCREMENTAL_INDEXING": False,
+    "MAX_RETRIES": 3,
+}
+
+
+class TestVectorIndexer(unittest.TestCase):
+    """Test cases for VectorIndexer class"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Patch Config, the Azure clients and the tokenizer once for the class"""
+        patcher = patch.multiple(
+            'src.vector_indexer',
+            Config=DEFAULT, SearchClient=DEFAULT, AzureOpenAI=DEFAULT,
+            autospec=True, spec_set=True
+        )
+        mocks = patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        cls.mock_config = mocks['Config']
+        
+        # The real encoding is downloaded on first use
+        patcher = patch('src.vector_indexer.tiktoken.get_encoding', autospec=True)
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        
+        # Undo config changes made by earlier tests
+        self.mock_config.configure_mock(**BASE_CONFIG, CACHE_DIR=self.temp_dir)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+    
+    def test_indexed_files_cache_persists(self):
+        """Test the append log is reloaded over the cache and compacted into it"""
+        self.mock_config.INCREMENTAL_INDEXING = True
+        log_file = os.path.join(self.temp_dir, "test-vector-index_files.log")
+        
+        # A first run logs every entry, so saving compacts the log
+        indexer = VectorIndexer()
+        indexer._record_indexed_file("/share/a.txt", 1.0)
+        indexer._record_indexed_file("/share/b.txt", 2.0)
+        indexer._record_indexed_file("/share/c.txt", 3.0)
+        indexer._save_indexed_files_cache()
+        self.assertFalse(os.path.exists(log_file))
+        
+        # One change in three entries stays in the log
+        indexer = VectorIndexer()
+        self.assertEqual(indexer.indexed_files_cache, {"/share/a.txt": 1.0, "/share/b.txt": 2.0, "/share/c.txt": 3.0})
+        indexer._record_indexed_file("/share/a.txt", 4.0)
+        indexer._save_indexed_files_cache()
+        self.assertTrue(os.path.exists(log_file))
+        
+        # The log entry wins over the cache; a second change compacts
+        indexer = VectorIndexer()
+        self.assertEqual(indexer.indexed_files_cache, {"/share/a.txt": 4.0, "/share/b.txt": 2.0, "/share/c.txt": 3.0})
+        indexer._record_indexed_file("/share/d.txt", 5.0)
+        indexer._save_indexed_files_cache()
+        self.assertFalse(os.path.exists(log_file))
+        
+        indexer = VectorIndexer()
+        self.assertEqual(
+            indexer.indexed_files_cache,
+            {"/share/a.txt": 4.0, "/share/b.txt": 2.0, "/share/c.txt": 3.0, "/share/d.txt": 5.0}
+        )
+    
+    def test_indexed_files_log_torn_line_skipped(self):
+        """Test a partly written last log line from an interrupted run is ignored"""
+        self.mock_config.INCREMENTAL_INDEXING = True
+        with open(os.path.join(self.temp_dir, "test-vector-index_files.log"), 'w', encoding='utf-8') as f:
+            f.write("/share/a.txt|1.0\n/share/b.t")
+        
+        indexer = VectorIndexer()
+        
+        self.assertEqual(indexer.indexed_files_cache, {"/share/a.txt": 1.0})
+        self.assertEqual(indexer._files_log_entries, 1)
+        
+        # Entries logged after the torn line are read back intact
+        indexer._record_indexed_file("/share/c.txt", 2.0)
+        indexer._files_log.close()
+        
+        self.assertEqual(VectorIndexer().indexed_files_cache, {"/share/a.txt": 1.0, "/share/c.txt": 2.0})
+    
+    def test_indexed_files_cache_fallbacks(self):
+        """Test a gzip cache is loaded ahead of an uncompressed one"""
+        self.mock_config.INCREMENTAL_INDEXING = True
+        cache_file = os.path.join(self.temp_dir, "test-vector-index_files.cache")
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            f.write("/share/plain.txt|1.0\n")
+        
+        # Only the uncompressed cache of earlier versions
+        self.assertEqual(VectorIndexer().indexed_files_cache, {"/share/plain.txt": 1.0})
+        
+        with gzip.open(f"{cache_file}.gz", 'wt', encoding='utf-8') as f:
+            f.write("/share/gzip.txt|2.0\n")
+        
+        self.assertEqual(VectorIndexer().indexed_files_cache, {"/share/gzip.txt": 2.0})
+        
+        # Compaction writes the preferred cache (zstd when installed), which
+        # is read ahead of both
+        indexer = VectorIndexer()
+        indexer._record_indexed_file("/share/new.txt", 3.0)
+        indexer._save_indexed_files_cache()
+        
+        self.assertEqual(VectorIndexer().indexed_files_cache, {"/share/gzip.txt": 2.0, "/share/new.txt": 3.0})
+    
+    def test_embedding_cache_round_trip(self):
+        """Test cached embeddings are read back by a new indexer within float16 precision"""
+        self.mock_config.CACHE_EMBEDDINGS = True
+        embedding = [0.0123, -0.25, 0.3333]
+        
+        indexer = VectorIndexer()
+        indexer._cache_embedding(_embedding_key("text"), embedding)
+        indexer._save_embedding_cache()
+        
+        cached = VectorIndexer()._cached_embedding(_embedding_key("text"))
+        
+        self.assertEqual(len(cached), len(embedding))
+        for value, expected in zip(cached, embedding):
+            self.assertAlmostEqual(value, expected, delta=abs(expected) * 1e-3)
+    
+    def test_legacy_embedding_cache_imported(self):
+        """Test a pickled cache from earlier versions is imported into a new database"""
+        self.mock_config.CACHE_EMBEDDINGS = True
+        with open(os.path.join(self.temp_dir, "test-vector-index_embeddings.cache"), 'wb') as f:
+            pickle.dump({_embedding_key("text"): [0.5, -0.25]}, f)
+        
+        indexer = VectorIndexer()
+        
+        self.assertEqual(indexer._cached_embedding(_embedding_key("text")), [0.5, -0.25])
+    
+    def test_cached_embedding_skips_api_call(self):
+        """Test texts already in the cache are not sent to the embeddings API"""
+        self.mock_config.CACHE_EMBEDDINGS = True
+        indexer = VectorIndexer()
+        indexer.openai_client = MagicMock()
+        create = indexer.openai_client.embeddings.create
+        create.return_value = MagicMock(data=[MagicMock(embedding=[0.5, 0.25], index=0)])
+        
+        first = indexer.generate_embeddings_batch(["text"])
+        second = indexer.generate_embeddings_batch(["text"])
+        
+        self.assertEqual(first, [[0.5, 0.25]])
+        self.assertEqual(second, [[0.5, 0.25]])
+        create.assert_called_once()
+        self.assertEqual(indexer.stats["embedding_api_calls"], 1)
+    
+    def test_embeddings_batch_inside_event_loop(self):
+        """Test several batches are embedded one after another from a running event loop"""
+        indexer = VectorIndexer()
+        indexer.openai_client = MagicMock()
+        create = indexer.openai_client.embeddings.create
+        create.side_effect = lambda input, model: MagicMock(
+            data=[MagicMock(embedding=[float(len(text))], index=i) for i, text in enumerate(input)]
+        )
+        texts = ["x" * (i + 1) for i in range(_EMBEDDING_BATCH_SIZE + 1)]
+        
+        async def embed():
+            return indexer.generate_embeddings_batch(texts)
+        
+        embeddings = asyncio.run(embed())
+        
+        self.assertEqual(embeddings, [[float(len(text))] for text in texts])
+        self.assertEqual(create.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()